@@ -0,0 +1,67 @@
+# Standard library imports
+import multiprocessing
+import resource
+import time
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+
+
+def run_measured(fn, args, conn):
+    """Run fn in the current process and send its wall time and extra peak RSS."""
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send((elapsed, (rss_after - rss_before) * 1024))
+    conn.close()
+
+
+def measure(fn, *args, repeat=3):
+    """
+    Measure a callable in fresh forked processes so each run gets its own peak RSS.
+
+    Pillow allocates pixel buffers outside the Python allocator, so the peak resident set
+    size is used instead of tracemalloc.
+
+    Args:
+        fn (callable): The function to measure.
+        *args: Arguments passed to fn.
+        repeat (int): Number of runs, the fastest is reported.
+
+    Returns:
+        dict: "seconds" (best wall time) and "peak_bytes" (largest extra peak RSS).
+    """
+    context = multiprocessing.get_context("fork")
+    times, peaks = [], []
+    for _ in range(repeat):
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(target=run_measured, args=(fn, args, child_conn))
+        process.start()
+        elapsed, peak = parent_conn.recv()
+        process.join()
+        times.append(elapsed)
+        peaks.append(peak)
+    return {"seconds": min(times), "peak_bytes": max(peaks)}
+
+
+def synthetic_background(megapixels, mode="RGB", aspect=3 / 2):
+    """
+    Create a gradient background of roughly the given number of megapixels.
+
+    Args:
+        megapixels (float): Target pixel count in millions.
+        mode (str): Image mode of the background.
+        aspect (float): Width to height ratio.
+
+    Returns:
+        Image: The synthetic background.
+    """
+    height = int((megapixels * 1e6 / aspect) ** 0.5)
+    width = int(height * aspect)
+    gradient = Image.linear_gradient("L").resize((width, height))
+    mirrored = gradient.transpose(Image.FLIP_LEFT_RIGHT)
+    return Image.merge("RGB", (gradient, mirrored, gradient)).convert(mode)
@@ -0,0 +1,104 @@
+"""
+Compare the region compositor against a masked paste and a full-frame Image.alpha_composite.
+
+Each method composites a single watermark and a square lattice over RGB and RGBA backgrounds.
+The masked paste is only correct on opaque backgrounds. The full-frame alpha_composite needs an
+RGBA overlay the size of the background, whose construction is part of its time.
+
+Run from the repository root:
+    python -m benchmarks.composite
+"""
+
+# Standard library imports
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from watermarker import WatermarkSpec, render_watermark, lattice_layout
+from watermarker.composite import blend_into
+from watermarker.tiling import tile_into
+from benchmarks.common import measure, synthetic_background
+
+MEGAPIXELS = (1, 12, 48)
+MODES = ("RGB", "RGBA")
+GAP = 100
+
+
+def lattice(background, watermark):
+    """The rows, columns and origin of a lattice centered on the background."""
+    center = (background.width / 2, background.height / 2)
+    origin, rows, cols = lattice_layout(center, watermark.size, GAP, background.size)
+    return rows, cols, origin
+
+
+def single_position(background, watermark):
+    return (
+        (background.width - watermark.width) // 2,
+        (background.height - watermark.height) // 2,
+    )
+
+
+def paste_single(background, watermark):
+    background.paste(watermark, single_position(background, watermark), watermark)
+
+
+def paste_tiled(background, watermark):
+    rows, cols, origin = lattice(background, watermark)
+    band = Image.new("RGBA", background.size, (0, 0, 0, 0))
+    tile_into(band, watermark, GAP, origin, rows, cols)
+    background.paste(band, (0, 0), band)
+
+
+def alpha_composite_single(background, watermark):
+    overlay = Image.new("RGBA", background.size, (0, 0, 0, 0))
+    overlay.paste(watermark, single_position(background, watermark))
+    Image.alpha_composite(background.convert("RGBA"), overlay).convert(background.mode)
+
+
+def alpha_composite_tiled(background, watermark):
+    rows, cols, origin = lattice(background, watermark)
+    overlay = Image.new("RGBA", background.size, (0, 0, 0, 0))
+    tile_into(overlay, watermark, GAP, origin, rows, cols)
+    Image.alpha_composite(background.convert("RGBA"), overlay).convert(background.mode)
+
+
+def blend_single(background, watermark):
+    blend_into(background, watermark, single_position(background, watermark))
+
+
+def blend_tiled(background, watermark):
+    rows, cols, origin = lattice(background, watermark)
+    tile_into(background, watermark, GAP, origin, rows, cols, use_mask=True)
+
+
+METHODS = {
+    "paste": (paste_single, paste_tiled),
+    "alpha_composite": (alpha_composite_single, alpha_composite_tiled),
+    "blend_into": (blend_single, blend_tiled),
+}
+
+
+def main():
+    print(
+        f"{'MP':>4}  {'mode':<6}{'method':<17}{'single ms':>11}{'tiled ms':>10}"
+        f"{'peak MB':>9}"
+    )
+    spec = WatermarkSpec(text="Watermark", opacity=60, rotation=30)
+    for megapixels in MEGAPIXELS:
+        for mode in MODES:
+            background = synthetic_background(megapixels, mode)
+            watermark = render_watermark(spec, scale=background.height / 800)
+            for name, (single, tiled) in METHODS.items():
+                single_result = measure(single, background, watermark)
+                tiled_result = measure(tiled, background, watermark)
+                peak = max(single_result["peak_bytes"], tiled_result["peak_bytes"])
+                print(
+                    f"{megapixels:>4}  {mode:<6}{name:<17}"
+                    f"{single_result['seconds'] * 1000:>11.1f}"
+                    f"{tiled_result['seconds'] * 1000:>10.1f}{peak / 1e6:>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
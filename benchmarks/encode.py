@@ -0,0 +1,78 @@
+"""
+Chart encode time against output size for every encoder profile and format.
+
+Images given on the command line are used as the corpus, otherwise a smooth and a noisy
+synthetic background are generated. Every image is watermarked before it is encoded.
+
+Run from the repository root:
+    python -m benchmarks.encode [IMAGE ...]
+"""
+
+# Standard library imports
+import io
+import os
+import sys
+import time
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from watermarker import WatermarkSpec, apply_watermark, encoder_options, ENCODER_PROFILES
+from benchmarks.common import synthetic_background
+
+MEGAPIXELS = 12
+FORMATS = ("PNG", "JPEG", "WEBP")
+REPEAT = 3
+BAR_WIDTH = 30
+
+
+def synthetic_corpus():
+    """A smooth gradient and a photo-like noisy background."""
+    smooth = synthetic_background(MEGAPIXELS)
+    noise = Image.effect_noise(smooth.size, 40).convert("RGB")
+    return {"smooth": smooth, "noisy": Image.blend(smooth, noise, 0.3)}
+
+
+def load_corpus(paths):
+    corpus = {}
+    for path in paths:
+        with Image.open(path) as image:
+            corpus[os.path.basename(path)] = image.convert("RGB")
+    return corpus
+
+
+def encode(image, image_format, options):
+    """Return the best encode time and the output size."""
+    times = []
+    for _ in range(REPEAT):
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        image.save(buffer, image_format, **options)
+        times.append(time.perf_counter() - start)
+    return min(times), buffer.tell()
+
+
+def main():
+    corpus = load_corpus(sys.argv[1:]) if sys.argv[1:] else synthetic_corpus()
+    spec = WatermarkSpec(text="Watermark", opacity=60, tile="Multiple Diamond")
+
+    for name, image in corpus.items():
+        apply_watermark(image, spec, scale=image.height / 800)
+        print(f"{name} ({image.width}x{image.height})")
+        for image_format in FORMATS:
+            results = {
+                profile: encode(image, image_format, encoder_options(image_format, profile))
+                for profile in ENCODER_PROFILES
+            }
+            largest = max(size for _, size in results.values())
+            for profile, (seconds, size) in results.items():
+                bar = "#" * max(1, round(BAR_WIDTH * size / largest))
+                print(
+                    f"  {image_format:<5}{profile:<10}{seconds * 1000:>8.0f} ms"
+                    f"{size / 1e6:>8.2f} MB  {bar}"
+                )
+
+
+if __name__ == "__main__":
+    main()
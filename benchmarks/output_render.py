@@ -0,0 +1,64 @@
+"""
+Compare the final-render path against upscaling the preview raster.
+
+Run from the repository root:
+    python -m benchmarks.output_render
+"""
+
+# Standard library imports
+
+# Third-party library imports
+
+# Local imports
+from utils import RESAMPLE_METHOD
+from watermarker import WatermarkSpec, render_watermark, tile_watermark, apply_watermark
+from benchmarks.common import measure, synthetic_background
+
+PREVIEW_W = 1400
+MEGAPIXELS = (12, 24, 50)
+SPECS = {
+    "text single": WatermarkSpec(text="Watermarker", size=2.0, rotation=30),
+    "text diamond": WatermarkSpec(
+        text="Watermarker", rotation=30, tile="Multiple Diamond", tile_gap=40
+    ),
+}
+
+
+def upscale_preview(bg_image, spec, ratio):
+    """The previous save path: tile at preview size, then upscale the whole raster."""
+    preview_w, preview_h = int(bg_image.width / ratio), int(bg_image.height / ratio)
+    watermark = tile_watermark(render_watermark(spec), spec, preview_w, preview_h)
+    w, h = watermark.size
+    watermark = watermark.resize(
+        (int(w * ratio), int(h * ratio)), resample=RESAMPLE_METHOD
+    )
+    x = int(spec.position[0] * bg_image.width - watermark.width / 2)
+    y = int(spec.position[1] * bg_image.height - watermark.height / 2)
+    bg_image.copy().paste(watermark, (x, y), watermark)
+
+
+def render_at_output(bg_image, spec, ratio):
+    """The final-render path: rasterize at the target size."""
+    apply_watermark(bg_image.copy(), spec, scale=ratio)
+
+
+def main():
+    print(
+        f"{'case':<16}{'MP':>5}{'upscale s':>12}{'upscale MB':>12}"
+        f"{'output s':>11}{'output MB':>11}"
+    )
+    for megapixels in MEGAPIXELS:
+        bg_image = synthetic_background(megapixels)
+        ratio = bg_image.width / PREVIEW_W
+        for name, spec in SPECS.items():
+            old = measure(upscale_preview, bg_image, spec, ratio)
+            new = measure(render_at_output, bg_image, spec, ratio)
+            print(
+                f"{name:<16}{megapixels:>5}"
+                f"{old['seconds']:>12.3f}{old['peak_bytes'] / 1e6:>12.1f}"
+                f"{new['seconds']:>11.3f}{new['peak_bytes'] / 1e6:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
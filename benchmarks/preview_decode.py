@@ -0,0 +1,63 @@
+"""
+Measure time-to-first-preview of full decoding against reduced-scale decoding.
+
+Run from the repository root:
+    python -m benchmarks.preview_decode
+"""
+
+# Standard library imports
+import os
+import tempfile
+import time
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from watermarker import fit_size, decode_preview
+from benchmarks.common import synthetic_background
+
+CANVAS_SIZE = (1400, 900)
+MEGAPIXELS = (12, 24, 60)
+FORMATS = ("jpeg", "png")
+
+
+def full_decode(path):
+    """The previous preview path: decode everything, then resize."""
+    with Image.open(path) as image:
+        image.copy().resize(fit_size(image.size, CANVAS_SIZE))
+
+
+def reduced_decode(path):
+    """The draft/reduce preview path."""
+    with Image.open(path) as image:
+        decode_preview(image, fit_size(image.size, CANVAS_SIZE))
+
+
+def best_time(fn, path, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print(f"{'format':<8}{'MP':>5}{'full s':>10}{'reduced s':>12}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for megapixels in MEGAPIXELS:
+            background = synthetic_background(megapixels)
+            for image_format in FORMATS:
+                path = os.path.join(directory, f"{megapixels}.{image_format}")
+                background.save(path)
+                full = best_time(full_decode, path)
+                reduced = best_time(reduced_decode, path)
+                print(
+                    f"{image_format:<8}{megapixels:>5}{full:>10.3f}{reduced:>12.3f}"
+                    f"{full / reduced:>9.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
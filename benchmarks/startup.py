@@ -0,0 +1,90 @@
+"""
+Track the startup budget: import time of the GUI modules and time-to-first-frame.
+
+Run from the repository root:
+    python -m benchmarks.startup
+"""
+
+# Standard library imports
+import os
+import subprocess
+import sys
+import time
+
+# Third-party library imports
+
+# Local imports
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+# Builds the main window and prints once the main view is packed and drawn
+FIRST_FRAME_SCRIPT = """
+from extensions import MainApplication
+
+app = MainApplication()
+
+def check():
+    if app.current_view is None:
+        app.after(1, check)
+        return
+    app.update_idletasks()
+    print("ready", flush=True)
+    app.destroy()
+
+app.after(0, check)
+app.mainloop()
+"""
+
+
+def run_python(*args):
+    """Run a fresh interpreter in the repository root and return its wall time."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args], cwd=ROOT, check=True, capture_output=True, text=True
+    )
+    return time.perf_counter() - start
+
+
+def import_profile(module):
+    """
+    Import a module with -X importtime.
+
+    Returns:
+        list: (cumulative microseconds, module name) pairs of every import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        entries.append((int(cumulative), name.strip()))
+    return entries
+
+
+def main():
+    baseline = min(run_python("-c", "pass") for _ in range(RUNS))
+    print(f"interpreter startup: {baseline * 1000:.0f} ms")
+
+    for module in ("extensions", "views.canvas_view", "watermarker"):
+        best = min(run_python("-c", f"import {module}") for _ in range(RUNS))
+        print(f"import {module}: {(best - baseline) * 1000:.0f} ms")
+
+    print("slowest imports of extensions:")
+    for cumulative, name in sorted(import_profile("extensions"), reverse=True)[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    try:
+        best = min(run_python("-c", FIRST_FRAME_SCRIPT) for _ in range(RUNS))
+        print(f"time-to-first-frame: {best * 1000:.0f} ms")
+    except subprocess.CalledProcessError as e:
+        print(f"time-to-first-frame: skipped ({e.stderr.strip().splitlines()[-1]})")
+
+
+if __name__ == "__main__":
+    main()
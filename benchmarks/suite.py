@@ -0,0 +1,267 @@
+"""
+Headless benchmark suite of the rendering code, with JSON output to diff between releases.
+
+Covers text rasterization across fonts and sizes, logo resize, opacity and rotation, grid
+tiling for every tile mode at several gaps, and the final composite and encode on synthetic
+backgrounds from 1 to 100 megapixels. Every case runs in forked processes (see measure) and
+reports its best wall time and its peak memory. The disk tile cache is disabled and the
+in-process caches are cleared in each case, so cold render costs are measured.
+
+The JSON has a fixed layout: a schema version, the environment, the configuration and the
+results sorted by case name, with sorted keys. Progress goes to stderr.
+
+Run from the repository root:
+    python -m benchmarks.suite [--megapixels 1 12] [--repeat 3] [--output results.json]
+    python -m benchmarks.suite --output new.json --compare old.json
+"""
+
+# Standard library imports
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+
+# Third-party library imports
+import PIL
+from PIL import Image, ImageDraw
+
+# Local imports
+from watermarker import (
+    WatermarkSpec,
+    rasterize_text,
+    rasterize_image,
+    transform_image,
+    apply_opacity,
+    render_watermark,
+    tile_watermark,
+    composite_watermark,
+    encoder_options,
+    find_font,
+    set_tile_cache,
+)
+from watermarker.render import font_cache, text_raster_cache
+from benchmarks.common import measure, synthetic_background
+
+SCHEMA_VERSION = 1
+MEGAPIXELS = (1, 12, 48, 100)
+REPEAT = 3
+FONTS = ("Arial", "Courier New", "Times New Roman", "DejaVu Serif")
+TEXT_SIZES = (0.5, 2.0, 8.0)
+LOGO_SIZE = (1600, 800)
+LOGO_SIZES = (1.0, 4.0, 16.0)
+LOGO_ROTATIONS = (0, 30, 90)
+OPACITY = 50
+TILE_MODES = ("Single", "Multiple Square", "Multiple Diamond")
+GAPS = (0, 50, 200)
+ENCODE_FORMATS = ("PNG", "JPEG")
+ROTATION = 30
+PREVIEW_HEIGHT = 800
+
+
+def synthetic_logo():
+    """An RGBA logo with an anti-aliased transparent edge and a color gradient."""
+    gradient = Image.linear_gradient("L").resize(LOGO_SIZE)
+    logo = Image.merge("RGB", (gradient, gradient.transpose(Image.ROTATE_180), gradient))
+    mask = Image.new("L", (LOGO_SIZE[0] * 2, LOGO_SIZE[1] * 2), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0) + mask.size, fill=255)
+    logo.putalpha(mask.resize(LOGO_SIZE, Image.LANCZOS))
+    return logo
+
+
+def clear_caches():
+    font_cache.clear()
+    text_raster_cache.clear()
+
+
+def text_raster(spec):
+    clear_caches()
+    rasterize_text(spec)
+
+
+def logo_resize(spec, logo):
+    rasterize_image(spec, logo)
+
+
+def logo_opacity(spec, resized):
+    apply_opacity(resized, spec)
+
+
+def logo_rotate(spec, logo):
+    transform_image(spec, logo)
+
+
+def grid(watermark, spec, background, scale):
+    tile_watermark(watermark, spec, background.width, background.height, scale)
+
+
+def composite(background, watermark, spec, scale):
+    # The background is a copy-on-write page of the parent, compositing in place is private
+    composite_watermark(background, watermark, spec, background.size, scale)
+
+
+def encode(image, image_format):
+    image.save(io.BytesIO(), image_format, **encoder_options(image_format))
+
+
+def text_cases():
+    """Text rasterization for every font and size."""
+    for font in FONTS:
+        for size in TEXT_SIZES:
+            spec = WatermarkSpec(text="Watermark", font=font, size=size)
+            params = {"font": font, "font_found": bool(find_font(font)), "size": size}
+            yield f"text/raster/{font}/size={size}", params, text_raster, (spec,)
+
+
+def logo_cases():
+    """Logo resize, opacity and single-pass scale and rotation."""
+    logo = synthetic_logo()
+    for size in LOGO_SIZES:
+        spec = WatermarkSpec(is_text=False, size=size, opacity=OPACITY)
+        resized = rasterize_image(spec, logo)
+        params = {"size": size, "height": resized.height}
+        yield f"logo/resize/size={size}", params, logo_resize, (spec, logo)
+        yield f"logo/opacity/size={size}", params, logo_opacity, (spec, resized)
+        for rotation in LOGO_ROTATIONS:
+            yield (
+                f"logo/rotate/size={size}/rotation={rotation}",
+                dict(params, rotation=rotation),
+                logo_rotate,
+                (spec.evolve(rotation=rotation), logo),
+            )
+
+
+def background_cases(megapixels):
+    """Grid tiling, composite and encode on one synthetic background."""
+    background = synthetic_background(megapixels)
+    scale = background.height / PREVIEW_HEIGHT
+    base = WatermarkSpec(text="Watermark", rotation=ROTATION, opacity=OPACITY)
+    watermark = render_watermark(base, scale=scale)
+    params = {
+        "megapixels": megapixels,
+        "width": background.width,
+        "height": background.height,
+    }
+    megapixels = f"{megapixels:g}"
+
+    for mode in TILE_MODES:
+        for gap in GAPS if mode != "Single" else GAPS[:1]:
+            spec = base.evolve(tile=mode, tile_gap=gap)
+            yield (
+                f"grid/{mode}/gap={gap}/mp={megapixels}",
+                dict(params, tile=mode, gap=gap),
+                grid,
+                (watermark, spec, background, scale),
+            )
+        spec = base.evolve(tile=mode, tile_gap=GAPS[1])
+        yield (
+            f"composite/{mode}/mp={megapixels}",
+            dict(params, tile=mode, gap=GAPS[1]),
+            composite,
+            (background, watermark, spec, scale),
+        )
+
+    # Encode a watermarked frame, a plain gradient would compress unrealistically well
+    composite_watermark(
+        background, watermark, base.evolve(tile=TILE_MODES[2]), background.size, scale
+    )
+    for image_format in ENCODE_FORMATS:
+        yield (
+            f"encode/{image_format}/mp={megapixels}",
+            dict(params, format=image_format),
+            encode,
+            (background, image_format),
+        )
+
+
+def run_cases(cases, repeat):
+    """Measure every case, returning its result record."""
+    results = []
+    for name, params, function, args in cases:
+        result = measure(function, *args, repeat=repeat)
+        results.append(
+            {
+                "name": name,
+                "group": name.split("/")[0],
+                "params": params,
+                "seconds": round(result["seconds"], 6),
+                "peak_bytes": result["peak_bytes"],
+            }
+        )
+        print(
+            f"{name:<48}{result['seconds'] * 1000:>10.1f} ms"
+            f"{result['peak_bytes'] / 1e6:>9.1f} MB",
+            file=sys.stderr,
+        )
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """Print the time and memory ratio of every case against a baseline report."""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {result["name"]: result for result in json.load(file)["results"]}
+    print(f"{'case':<48}{'time':>9}{'memory':>9}", file=sys.stderr)
+    for result in results:
+        old = baseline.get(result["name"])
+        if old is None:
+            print(f"{result['name']:<48}{'new':>9}", file=sys.stderr)
+            continue
+        time_ratio = result["seconds"] / old["seconds"] if old["seconds"] else 0.0
+        memory_ratio = (
+            result["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 0.0
+        )
+        print(
+            f"{result['name']:<48}{time_ratio:>8.2f}x{memory_ratio:>8.2f}x",
+            file=sys.stderr,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--megapixels", type=float, nargs="+", default=MEGAPIXELS, help="Background sizes."
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Runs per case.")
+    parser.add_argument("--output", help="JSON report path, stdout by default.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against.")
+    args = parser.parse_args(argv)
+
+    # Measure rendering, not reads from a warm disk cache
+    set_tile_cache(None)
+
+    results = run_cases(text_cases(), args.repeat)
+    results += run_cases(logo_cases(), args.repeat)
+    for megapixels in args.megapixels:
+        results += run_cases(background_cases(megapixels), args.repeat)
+    results.sort(key=lambda result: result["name"])
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "environment": environment(),
+        "config": {"megapixels": list(args.megapixels), "repeat": args.repeat},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
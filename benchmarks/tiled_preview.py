@@ -0,0 +1,107 @@
+"""
+Compare the tiled preview as one grid PhotoImage against canvas items sharing one tile PhotoImage.
+
+Each frame of a tile gap sweep is rendered and presented both ways. Without a display only the
+Pillow side (render and buffer sizes) is measured.
+
+Run from the repository root:
+    python -m benchmarks.tiled_preview
+"""
+
+# Standard library imports
+from tkinter import Canvas, TclError, Tk
+import time
+
+# Third-party library imports
+from PIL import ImageTk
+
+# Local imports
+from components import PhotoPresenter
+from watermarker import RenderPipeline, WatermarkSpec
+from watermarker.cache import image_nbytes
+
+CANVAS_SIZE = (1200, 800)
+GAPS = range(20, 220, 20)
+SIZES = (0.5, 1.0, 2.0)
+MODES = ("Multiple Square", "Multiple Diamond")
+
+
+def grid_frames(specs, canvas=None):
+    """The previous backend: render the full grid and copy it into a new PhotoImage."""
+    pipeline = RenderPipeline()
+    item, photo, peak = None, None, 0
+    for spec in specs:
+        grid = pipeline.render(spec, CANVAS_SIZE)
+        peak = max(peak, image_nbytes(grid))
+        if canvas is not None:
+            photo = ImageTk.PhotoImage(image=grid)
+            if item is None:
+                item = canvas.create_image(canvas_center(), image=photo)
+            else:
+                canvas.itemconfig(item, image=photo)
+            canvas.update_idletasks()
+    return peak
+
+
+def item_frames(specs, canvas=None):
+    """The canvas item backend: render one tile and place it at every lattice position."""
+    pipeline = RenderPipeline()
+    presenter = PhotoPresenter(canvas, "watermark") if canvas is not None else None
+    peak = 0
+    for spec in specs:
+        tile = pipeline.render_tile(spec)
+        peak = max(peak, image_nbytes(tile))
+        if presenter is not None:
+            presenter.present_tiled(
+                tile,
+                canvas_center(),
+                spec.tile_gap,
+                CANVAS_SIZE,
+                diamond=spec.tile == "Multiple Diamond",
+            )
+            canvas.update_idletasks()
+    return peak
+
+
+def canvas_center():
+    return (CANVAS_SIZE[0] / 2, CANVAS_SIZE[1] / 2)
+
+
+def timed(fn, specs, canvas):
+    start = time.perf_counter()
+    peak = fn(specs, canvas)
+    return (time.perf_counter() - start) / len(specs), peak
+
+
+def main():
+    try:
+        root = Tk()
+        canvas = Canvas(root, width=CANVAS_SIZE[0], height=CANVAS_SIZE[1])
+        canvas.pack()
+    except TclError as e:
+        print(f"no display ({e}), measuring the Pillow side only")
+        root, canvas = None, None
+
+    print(
+        f"{'mode':<18}{'size':>6}{'grid ms':>10}{'items ms':>10}"
+        f"{'grid MB':>10}{'tile MB':>10}"
+    )
+    for mode in MODES:
+        for size in SIZES:
+            base = WatermarkSpec(text="Watermark", size=size, rotation=30, tile=mode)
+            specs = [base.evolve(tile_gap=gap) for gap in GAPS]
+            grid_ms, grid_peak = timed(grid_frames, specs, canvas)
+            item_ms, item_peak = timed(item_frames, specs, canvas)
+            if canvas is not None:
+                canvas.delete("all")
+            print(
+                f"{mode:<18}{size:>6}{grid_ms * 1000:>10.1f}{item_ms * 1000:>10.1f}"
+                f"{grid_peak / 1e6:>10.1f}{item_peak / 1e6:>10.2f}"
+            )
+
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,10 @@
 from .nav_bar import NavBar
 from .properties import Properties
 from .save_progress_dialog import SaveProgressDialog
+from .render_scheduler import RenderScheduler
+from .render_worker import RenderWorker
+from .photo_presenter import PhotoPresenter
+from .save_task import SaveTask
+from .batch_queue import BatchQueue
+from .batch_progress_dialog import BatchProgressDialog
+from .stats_overlay import StatsOverlay
@@ -0,0 +1,174 @@
+# Standard library imports
+import os
+import time
+
+# Third-party library imports
+from customtkinter import (
+    CTkToplevel,
+    CTkLabel,
+    CTkProgressBar,
+    CTkButton,
+    CTkScrollableFrame,
+)
+
+
+# Local imports
+from utils import *
+
+# Constants
+STATUS_COLORS = {
+    "Queued": WHITE,
+    "Done": TURQUOISE,
+    "Failed": RED,
+    "Cancelled": WHITE,
+}
+
+
+class BatchProgressDialog(CTkToplevel):
+    """
+    BatchProgressDialog class represents a dialog window for displaying batch progress.
+
+    This class extends CTkToplevel and lists every file of a batch with its status, an overall
+    progress bar, the throughput in images and megabytes per second, and a button to cancel
+    the files that have not started.
+
+    Parameters:
+        parent (Tk): The parent Tkinter window.
+        paths (list): The image files of the batch.
+        on_cancel (callable): Called when the user cancels the batch.
+        *args, **kwargs: Additional arguments passed to the CTkToplevel constructor.
+    """
+
+    def __init__(self, parent, paths, on_cancel=None, *args, **kwargs):
+        """
+        Initialize the BatchProgressDialog.
+
+        Args:
+            parent (Tk): The parent Tkinter widget.
+            paths (list): The image files of the batch.
+            on_cancel (callable): Called when the user cancels the batch.
+            *args, **kwargs: Additional arguments passed to the CTkToplevel constructor.
+        """
+        CTkToplevel.__init__(self, parent, *args, **kwargs)
+        self.parent = parent
+        self.on_cancel = on_cancel
+        self.attributes("-topmost", "true")
+        self.title("Watermarking files...")
+
+        # Set the size and position of the window
+        self.window_w = 420
+        self.window_h = 420
+        self.x = (self.parent.winfo_screenwidth() // 2) - (self.window_w // 2)
+        self.y = (self.parent.winfo_screenheight() // 2) - (self.window_h // 2)
+        self.geometry(f"{self.window_w}x{self.window_h}+{self.x}+{self.y}")
+
+        # Throughput counters
+        self.total = len(paths)
+        self.finished = 0
+        self.failed = 0
+        self.bytes_done = 0
+        self.start_time = time.perf_counter()
+
+        # Create and pack widgets
+        self.file_list = CTkScrollableFrame(self, width=self.window_w - 40)
+        self.file_list.pack(padx=10, pady=10, fill="both", expand=True)
+        self.file_list.grid_columnconfigure(0, weight=1)
+        self.rows = {}
+        for row, path in enumerate(paths):
+            self.add_row(row, path)
+
+        self.progress_bar = CTkProgressBar(self, mode="determinate")
+        self.progress_bar.pack(pady=5)
+        self.progress_bar.set(0)
+
+        self.progress_label = CTkLabel(self, text=f"0 of {self.total} files")
+        self.progress_label.pack()
+
+        self.cancel_btn = CTkButton(
+            self,
+            fg_color=GREY,
+            border_color=WHITE,
+            border_width=1,
+            hover_color=TURQUOISE,
+            text_color=WHITE,
+            text="Cancel",
+            command=self.cancel,
+        )
+        self.cancel_btn.pack(pady=10)
+
+    def add_row(self, row, path):
+        """
+        Add the name and status labels of a file to the list.
+
+        Args:
+            row (int): The grid row of the file.
+            path (str): The image file.
+        """
+        name_label = CTkLabel(self.file_list, text=os.path.basename(path), anchor="w")
+        name_label.grid(row=row, column=0, sticky="w", padx=5)
+        status_label = CTkLabel(
+            self.file_list, text="Queued", text_color=STATUS_COLORS["Queued"]
+        )
+        status_label.grid(row=row, column=1, sticky="e", padx=5)
+        self.rows[path] = status_label
+
+    def set_status(self, path, status):
+        """
+        Show the status of a file.
+
+        Args:
+            path (str): The image file.
+            status (str): One of the STATUS_COLORS keys.
+        """
+        if path in self.rows:
+            self.rows[path].configure(text=status, text_color=STATUS_COLORS[status])
+
+    def file_done(self, path, error):
+        """
+        Mark a file as done or failed and update the overall progress and throughput.
+
+        Args:
+            path (str): The image file.
+            error (str): The error message, None if the file was saved.
+        """
+        self.finished += 1
+        if error:
+            self.failed += 1
+            self.set_status(path, "Failed")
+        else:
+            self.set_status(path, "Done")
+            try:
+                self.bytes_done += os.path.getsize(path)
+            except OSError:
+                pass
+
+        elapsed = max(time.perf_counter() - self.start_time, 1e-9)
+        images_per_sec = (self.finished - self.failed) / elapsed
+        mb_per_sec = self.bytes_done / elapsed / 1e6
+        self.progress_bar.set(self.finished / self.total if self.total else 1)
+        self.progress_label.configure(
+            text=f"{self.finished} of {self.total} files  |  "
+            f"{images_per_sec:.2f} images/s  |  {mb_per_sec:.1f} MB/s"
+        )
+
+    def cancel(self):
+        """
+        Ask the batch to stop, files that already started still finish.
+        """
+        self.cancel_btn.configure(state="disabled")
+        self.progress_label.configure(text="Cancelling...")
+        if self.on_cancel:
+            self.on_cancel()
+
+    def stop(self, text="Batch Complete!"):
+        """
+        Mark the files that never ran as cancelled and turn Cancel into Close.
+
+        Args:
+            text (str): The final message.
+        """
+        for status_label in self.rows.values():
+            if status_label.cget("text") == "Queued":
+                status_label.configure(text="Cancelled")
+        self.progress_label.configure(text=text)
+        self.cancel_btn.configure(state="normal", text="Close", command=self.destroy)
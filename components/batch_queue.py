@@ -0,0 +1,121 @@
+# Standard library imports
+from threading import Event, Thread
+import queue
+
+# Third-party library imports
+
+# Local imports
+
+# Constants
+POLL_MS = 100
+
+
+class BatchQueue:
+    """
+    BatchQueue runs a batch of watermark jobs on a worker process pool and reports each finished
+    file on the Tk main thread.
+
+    The pool is driven by run_batch on a background thread. Finished files go through a queue
+    that the main thread polls with after(), so no Tk call is made off the main thread. Setting
+    the cancel event drops the files that have not started; files already running still finish.
+
+    Parameters:
+        widget (Misc): The widget whose event loop polls the results.
+        spec (WatermarkSpec): The watermark settings applied to every file.
+        paths (list): The image files and folders to watermark.
+        output_dir (str): Directory the watermarked files are written to.
+        on_file (callable): Called as on_file(path, error) on the main thread after each file.
+        on_done (callable): Called as on_done(stats, error) on the main thread once the batch ended.
+        reference_size (tuple): The image size the spec pixels refer to.
+        workers (int): Number of worker processes, defaults to the CPU count.
+        poll_ms (int): Polling interval in milliseconds.
+    """
+
+    def __init__(
+        self,
+        widget,
+        spec,
+        paths,
+        output_dir,
+        on_file,
+        on_done,
+        reference_size=None,
+        workers=None,
+        poll_ms=POLL_MS,
+    ):
+        """
+        Initialize the BatchQueue and start its thread.
+
+        Args:
+            widget (Misc): The widget whose event loop polls the results.
+            spec (WatermarkSpec): The watermark settings applied to every file.
+            paths (list): The image files and folders to watermark.
+            output_dir (str): Directory the watermarked files are written to.
+            on_file (callable): Called as on_file(path, error) after each file.
+            on_done (callable): Called as on_done(stats, error) once the batch ended.
+            reference_size (tuple): The image size the spec pixels refer to.
+            workers (int): Number of worker processes, defaults to the CPU count.
+            poll_ms (int): Polling interval in milliseconds.
+        """
+        self.widget = widget
+        self.spec = spec
+        self.paths = list(paths)
+        self.output_dir = output_dir
+        self.on_file = on_file
+        self.on_done = on_done
+        self.reference_size = reference_size
+        self.workers = workers
+        self.poll_ms = poll_ms
+        self.cancel_event = Event()
+        self.results = queue.Queue()
+        self.stats = None
+        self.error = None
+
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def run(self):
+        """Worker thread, drives the process pool and queues every finished file."""
+        # The process pool machinery is only imported once a batch runs
+        from watermarker import run_batch
+
+        try:
+            self.stats = run_batch(
+                self.spec,
+                self.paths,
+                self.output_dir,
+                workers=self.workers,
+                progress=lambda path, error: self.results.put((path, error)),
+                reference_size=self.reference_size,
+                cancel=self.cancel_event,
+            )
+        except Exception as e:
+            self.error = e
+
+    def poll(self):
+        """Deliver finished files on the main thread until the batch ended."""
+        # Read the liveness first so the files finished last are not missed
+        alive = self.thread.is_alive()
+        while True:
+            try:
+                path, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.on_file(path, error)
+        if alive:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+        else:
+            self.poll_id = None
+            self.on_done(self.stats, self.error)
+
+    def cancel(self):
+        """Drop the files that have not started, running files still finish."""
+        self.cancel_event.set()
+
+    def close(self):
+        """Cancel the batch and stop polling, nothing is reported afterwards."""
+        self.cancel()
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
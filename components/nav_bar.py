@@ -15,7 +15,8 @@ class NavBar(CTkFrame):
     NavBar represents the navigation bar in the application.
 
     This class provides buttons for various actions such as closing the app,
-    going back, adding text, adding a logo, removing the watermark, and creating the final image.
+    going back, adding text, adding a logo, removing the watermark, creating the final image, and
+    applying the watermark to a batch of files.
 
     Parameters:
         parent: The parent widget.
@@ -48,6 +49,9 @@ class NavBar(CTkFrame):
         # Initiate Remove Button
         self.initiate_remove_btn()
 
+        # Initiate Batch Button
+        self.initiate_batch_btn()
+
         # Initiate Create Button
         self.initiate_create_btn()
 
@@ -186,6 +190,44 @@ class NavBar(CTkFrame):
             lambda event: self.remove_btn.configure(text_color=WHITE, fg_color=GREY),
         )
 
+    def initiate_batch_btn(self):
+        """
+        Initialize the Batch button.
+
+        This button applies the watermark to the queued files, or to files chosen in a dialog.
+
+        """
+        self.batch_btn = CTkButton(
+            self,
+            fg_color=GREY,
+            border_color=WHITE,
+            border_width=1,
+            hover_color=WHITE,
+            text_color=WHITE,
+            text="Apply to Files",
+            command=self.parent.start_batch,
+        )
+        self.batch_btn.grid(row=0, column=11)
+        self.batch_btn.bind(
+            "<Enter>",
+            lambda event: self.batch_btn.configure(text_color=DARK, fg_color=WHITE),
+        )
+        self.batch_btn.bind(
+            "<Leave>",
+            lambda event: self.batch_btn.configure(text_color=WHITE, fg_color=GREY),
+        )
+        self.set_batch_count(len(self.parent.batch_paths))
+
+    def set_batch_count(self, count):
+        """
+        Show the number of queued files on the Batch button.
+
+        Args:
+            count (int): The number of files queued for the batch run.
+        """
+        text = f"Apply to {count} Files" if count else "Apply to Files"
+        self.batch_btn.configure(text=text)
+
     def initiate_create_btn(self):
         """
         Initialize the Create button.
@@ -215,5 +257,5 @@ class NavBar(CTkFrame):
             self.parent.initiate_watermark(False)
 
     def remove_btn_command(self):
-        if self.parent.watermark:
+        if self.parent.has_watermark:
             self.parent.remove_watermark()
@@ -0,0 +1,180 @@
+# Standard library imports
+
+# Third-party library imports
+from PIL import ImageChops, ImageTk
+
+# Local imports
+from watermarker import lattice_layout, lattice_positions
+
+
+def damaged_box(previous, image):
+    """
+    Return the box of the pixels that differ between two images of the same size and mode.
+
+    Args:
+        previous (Image): The image shown so far.
+        image (Image): The new image.
+
+    Returns:
+        tuple: The (left, upper, right, lower) box of the changed pixels, None if none changed.
+    """
+    # The default bounding box of an RGBA image only looks at alpha, color changes count too
+    return ImageChops.difference(previous, image).getbbox(alpha_only=False)
+
+
+class PhotoPresenter:
+    """
+    PhotoPresenter shows PIL images in canvas image items backed by one persistent PhotoImage.
+
+    Allocating a PhotoImage and copying pixels into Tcl on every property change dominates the
+    preview loop. The presenter keeps one PhotoImage and, while the size and mode of the rendered
+    image stay the same, pastes the new pixels into it in place. Only the region that differs
+    from the previous image is copied, and nothing is copied when the pixels are unchanged, as
+    after a drag re-renders the same watermark.
+
+    Tiled watermarks are shown as one canvas item per lattice cell, all sharing the PhotoImage of
+    a single tile, so the preview holds one tile instead of a full grid frame and re-tiling after
+    a gap change only moves items.
+
+    Parameters:
+        canvas (Canvas): The canvas that shows the image.
+        tag (str): The tag of the canvas image item.
+    """
+
+    def __init__(self, canvas, tag):
+        """
+        Initialize the PhotoPresenter.
+
+        Args:
+            canvas (Canvas): The canvas that shows the image.
+            tag (str): The tag of the canvas image item.
+        """
+        self.canvas = canvas
+        self.tag = tag
+        self.items = []
+        self.layout = None
+        self.photo = None
+        self.image = None
+
+    def present(self, image, center):
+        """
+        Show a single image centered on a canvas position.
+
+        Args:
+            image (Image): The image to show.
+            center (tuple): The (x, y) canvas position of the image center.
+
+        Returns:
+            list: The ids of the canvas image items.
+        """
+        self.update_photo(image)
+        self.place([center], "center")
+        return self.items
+
+    def present_tiled(self, tile, center, gap, cover_size, diamond=False):
+        """
+        Show a square or diamond lattice of a tile centered on a canvas position.
+
+        The lattice is anchored on a tile centered on center, as the tiled modes are at output
+        time, and covers the canvas.
+
+        Args:
+            tile (Image): The single watermark.
+            center (tuple): The (x, y) canvas position of the anchor tile center.
+            gap (int): The gap between tiles in pixels.
+            cover_size (tuple): The (width, height) the lattice must cover.
+            diamond (bool): True if the lattice should have a diamond pattern.
+
+        Returns:
+            list: The ids of the canvas image items.
+        """
+        self.update_photo(tile)
+        origin, rows, cols = lattice_layout(center, tile.size, gap, cover_size)
+        self.place(lattice_positions(tile.size, gap, origin, rows, cols, diamond), "nw")
+        return self.items
+
+    def update_photo(self, image):
+        """
+        Bring the PhotoImage up to date with an image, allocating only when its size changed.
+
+        Args:
+            image (Image): The image to show.
+        """
+        # Nothing to do when no render stage produced a new image
+        if image is self.image:
+            return
+
+        if (
+            self.photo is None
+            or self.image.size != image.size
+            or self.image.mode != image.mode
+        ):
+            self.photo = ImageTk.PhotoImage(image=image)
+            for item in self.items:
+                self.canvas.itemconfig(item, image=self.photo)
+        else:
+            box = damaged_box(self.image, image)
+            if box == (0, 0) + image.size:
+                self.photo.paste(image)
+            elif box is not None:
+                self.paste_region(image, box)
+        self.image = image
+
+    def place(self, positions, anchor):
+        """
+        Show the PhotoImage at every position, creating or deleting items as needed.
+
+        Args:
+            positions (list): The (x, y) canvas position of each item.
+            anchor (str): The anchor of the positions on the items.
+        """
+        layout = (tuple(positions), anchor)
+        if layout == self.layout:
+            return
+        self.layout = layout
+
+        # Delete the surplus items, move the existing ones and create the missing ones
+        for item in self.items[len(positions) :]:
+            self.canvas.delete(item)
+        del self.items[len(positions) :]
+        for item, position in zip(self.items, positions):
+            self.canvas.coords(item, position)
+            self.canvas.itemconfig(item, anchor=anchor)
+        for position in positions[len(self.items) :]:
+            self.items.append(
+                self.canvas.create_image(
+                    position, image=self.photo, anchor=anchor, tag=self.tag
+                )
+            )
+
+    def paste_region(self, image, box):
+        """
+        Copy one region of an image into the PhotoImage.
+
+        The region is converted into a small PhotoImage and copied with Tk's native photo copy,
+        replacing the pixels instead of compositing over them.
+
+        Args:
+            image (Image): The full image.
+            box (tuple): The (left, upper, right, lower) region to copy.
+        """
+        region = ImageTk.PhotoImage(image=image.crop(box))
+        self.canvas.tk.call(
+            str(self.photo),
+            "copy",
+            str(region),
+            "-to",
+            box[0],
+            box[1],
+            "-compositingrule",
+            "set",
+        )
+
+    def clear(self):
+        """Delete the canvas items and release the PhotoImage."""
+        for item in self.items:
+            self.canvas.delete(item)
+        self.items = []
+        self.layout = None
+        self.photo = None
+        self.image = None
@@ -1,7 +1,5 @@
 # Standard library imports
-from tkinter import StringVar, DoubleVar, IntVar, colorchooser
-from threading import Thread
-import time
+from tkinter import StringVar, DoubleVar, IntVar, colorchooser, filedialog, messagebox
 
 # Third-party library imports
 from customtkinter import (
@@ -17,13 +15,13 @@ from customtkinter import (
 
 # Local imports
 from utils import *
+from watermarker import WatermarkSpec, WatermarkLayout
 
 # Constants
 FONT = ("Open Sans", 15, "bold")
 LABEL_WIDTH = 80
 FRAME_PADX = 10
 FRAME_PADY = 2
-DEBOUNCE_SEC = 0.5
 
 
 class Properties(CTkToplevel):
@@ -32,6 +30,7 @@ class Properties(CTkToplevel):
 
     This class extends CTkToplevel and provides a graphical interface for users to configure
     various properties of a watermark, including text, font, color, size, opacity, rotation, and tiling.
+    The settings and placement can be exported to and loaded from a JSON layout file.
 
     Parameters:
         parent (Tk): The parent Tkinter window.
@@ -53,8 +52,6 @@ class Properties(CTkToplevel):
         self.configure(bg_color=GREY)
         self.parent = parent
         self.is_text = is_text
-        self.thread_is_running = False
-        self.last_execution_time = 0
 
         self.attributes("-topmost", "true")
         self.title("Watermark Properties")
@@ -65,11 +62,11 @@ class Properties(CTkToplevel):
         # Initialize the row count
         self.row_number = 0
 
+        # Set the update function to request a coalesced render
+        self.update_function = self.parent.render_scheduler.request
+
         # Check if the watermark is Text or Image
         if self.is_text:
-            # Set the update function to update_text_watermark
-            self.update_function = self.parent.update_text_watermark
-
             # Initialize Text Entry
             self.initiate_text()
 
@@ -79,10 +76,6 @@ class Properties(CTkToplevel):
             # Initialize color selector
             self.initiate_color()
 
-        else:
-            # Set the update function to update_image_watermark
-            self.update_function = self.parent.update_image_watermark
-
         # Initiate Size Selector
         self.initiate_size()
 
@@ -95,6 +88,9 @@ class Properties(CTkToplevel):
         # Initiate Tile Selector
         self.initiate_tile()
 
+        # Initiate Layout Export and Load Buttons
+        self.initiate_layout()
+
     def initiate_title(self):
         """Initialize the title label."""
         self.properties_title = CTkLabel(self, text="Properties:", font=FONT)
@@ -218,6 +214,7 @@ class Properties(CTkToplevel):
         )
         self.size_selector.grid(column=1, row=0)
         self.size_selector.set(1.0)
+        self.bind_interactive(self.size_selector)
 
         # Size Value Label
         self.size_value_var = StringVar()
@@ -308,6 +305,7 @@ class Properties(CTkToplevel):
         )
         self.rotation_selector.grid(column=1, row=0)
         self.rotation_selector.set(0)
+        self.bind_interactive(self.rotation_selector)
 
         # Rotation Value Label
         self.rotation_value_label = CTkLabel(
@@ -364,12 +362,109 @@ class Properties(CTkToplevel):
             variable=self.tile_gap,
         )
         self.tile_gap_selector.set(50)
+        self.bind_interactive(self.tile_gap_selector)
+        self.tile_gap.trace_add("write", self.watermark_callbacks)
 
         # Tile Gap Value Label
         self.tile_gap_value_label = CTkLabel(
             self.tile_frame, textvariable=self.tile_gap, font=FONT
         )
 
+    def initiate_layout(self):
+        """Initialize Layout-related elements."""
+        self.row_number += 1
+
+        # Layout Frame
+        self.layout_frame = CTkFrame(self, fg_color=DARK)
+        self.layout_frame.grid(
+            row=self.row_number, sticky=("e", "w"), padx=FRAME_PADX, pady=FRAME_PADY
+        )
+
+        # Layout Label
+        self.layout_label = CTkLabel(
+            self.layout_frame, text="Layout:", font=FONT, width=LABEL_WIDTH
+        )
+        self.layout_label.grid(column=0, row=0)
+
+        # Layout Export Button
+        self.export_layout_btn = CTkButton(
+            self.layout_frame,
+            fg_color=GREY,
+            hover_color=TURQUOISE,
+            text="Export",
+            width=70,
+            command=self.export_layout,
+        )
+        self.export_layout_btn.grid(column=1, row=0, padx=2)
+
+        # Layout Load Button
+        self.load_layout_btn = CTkButton(
+            self.layout_frame,
+            fg_color=GREY,
+            hover_color=TURQUOISE,
+            text="Load",
+            width=70,
+            command=self.load_layout,
+        )
+        self.load_layout_btn.grid(column=2, row=0, padx=2)
+
+    def export_layout(self):
+        """Save the current settings and placement as a resolution-independent layout."""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json", filetypes=LAYOUT_FILE_TYPES
+        )
+        if file_path:
+            layout = WatermarkLayout.from_spec(
+                self.parent.get_watermark_spec(),
+                (self.parent.canvas_w, self.parent.canvas_h),
+            )
+            try:
+                layout.save(file_path)
+            except OSError as e:
+                messagebox.showerror(title="Error saving layout", message=e)
+
+    def load_layout(self):
+        """Replace the watermark with one placed from a layout file."""
+        file_path = filedialog.askopenfilename(filetypes=LAYOUT_FILE_TYPES)
+        if file_path:
+            try:
+                self.parent.apply_layout(WatermarkLayout.load(file_path))
+            except (OSError, ValueError, TypeError) as e:
+                messagebox.showerror(title="Error loading layout", message=e)
+
+    def set_spec(self, spec):
+        """
+        Show the values of a spec, clamped to the slider ranges.
+
+        The variables are set directly so values between slider steps are kept.
+
+        Args:
+            spec (WatermarkSpec): The watermark settings in preview pixels.
+        """
+        if self.is_text:
+            self.text.set(spec.text)
+            self.font_combobox.set(spec.font)
+            self.color.set(spec.color)
+            self.color_selector.configure(fg_color=spec.color, hover_color=spec.color)
+        self.size.set(min(max(spec.size, 0.2), 8.0))
+        self.opacity.set(min(max(int(spec.opacity), 1), 100))
+        self.rotation.set(min(max(int(spec.rotation), -180), 180))
+        self.tile_gap.set(min(max(int(spec.tile_gap), 0), 200))
+        self.tile.set(spec.tile)
+
+    def bind_interactive(self, slider):
+        """
+        Render drafts while the slider is dragged and refine when it is released.
+
+        Args:
+            slider (CTkSlider): The slider to bind.
+        """
+        slider.bind("<Button-1>", lambda event: self.parent.set_interactive(True))
+        slider.bind("<B1-Motion>", lambda event: self.parent.set_interactive(True))
+        slider.bind(
+            "<ButtonRelease-1>", lambda event: self.parent.set_interactive(False)
+        )
+
     def choose_color(self):
         """Open color chooser dialog and set the chosen color."""
         # variable to store hexadecimal code of color
@@ -382,18 +477,9 @@ class Properties(CTkToplevel):
 
     def watermark_callbacks(self, var, index, mode):
         """Callback function for various watermark-related elements."""
-        current_time = time.time()
-        # Run the update function in a thread
-        if (
-            not self.thread_is_running
-            and (current_time - self.last_execution_time) > DEBOUNCE_SEC
-        ):
-            self.size_value_var.set("{:.2f}".format(self.size.get()))
-            # Update the last execution time
-            self.last_execution_time = current_time
-            # Run the update function in a thread
-            new_thread = Thread(target=self.threaded_update_function)
-            new_thread.start()
+        self.size_value_var.set("{:.2f}".format(self.size.get()))
+        # Request a render, bursts of changes are coalesced into the latest state
+        self.update_function()
 
     def tile_callbacks(self, var, index, mode):
         """Callback function for tile-related elements."""
@@ -403,14 +489,28 @@ class Properties(CTkToplevel):
             self.tile_gap_label.grid(column=0, row=1)
             self.tile_gap_selector.grid(column=1, row=1)
             self.tile_gap_value_label.grid(column=2, row=1)
-            self.tile_gap.trace_add("write", self.watermark_callbacks)
         else:
             self.tile_gap_label.grid_forget()
             self.tile_gap_selector.grid_forget()
             self.tile_gap_value_label.grid_forget()
 
-    def threaded_update_function(self):
-        """Run the update function with indication of a thread being running"""
-        self.thread_is_running = True
-        self.update_function()
-        self.thread_is_running = False
+    def get_spec(self):
+        """
+        Snapshot the current property values.
+
+        Returns:
+            WatermarkSpec: The watermark settings in preview pixels.
+        """
+        spec = WatermarkSpec(
+            is_text=bool(self.is_text),
+            size=self.size.get(),
+            opacity=self.opacity.get(),
+            rotation=self.rotation.get(),
+            tile=self.tile.get(),
+            tile_gap=self.tile_gap.get(),
+        )
+        if self.is_text:
+            spec = spec.evolve(
+                text=self.text.get(), font=self.font.get(), color=self.color.get()
+            )
+        return spec
@@ -0,0 +1,100 @@
+# Standard library imports
+import time
+
+# Third-party library imports
+
+# Local imports
+from utils import TIMING_ENABLED, timings
+
+# Constants
+COALESCE_MS = 40
+
+
+class RenderScheduler:
+    """
+    RenderScheduler coalesces bursts of render requests on the Tk event loop.
+
+    The first request of a burst schedules a flush COALESCE_MS later; requests arriving before
+    it only bump the generation counter, so the flush always renders the latest state and a
+    request made after a flush always gets its own trailing render. Every render receives the
+    generation it was started for, and presented() rejects generations older than the last one
+    shown, so a stale render finishing late never replaces a newer frame. With stage timing on,
+    the time from the first request of a burst to its frame is recorded as "preview_latency".
+
+    Parameters:
+        widget (Misc): The widget whose event loop runs the renders.
+        render (callable): Called with the generation to render.
+        delay_ms (int): Coalescing window in milliseconds.
+    """
+
+    def __init__(self, widget, render, delay_ms=COALESCE_MS):
+        """
+        Initialize the RenderScheduler.
+
+        Args:
+            widget (Misc): The widget whose event loop runs the renders.
+            render (callable): Called with the generation to render.
+            delay_ms (int): Coalescing window in milliseconds.
+        """
+        self.widget = widget
+        self.render = render
+        self.delay_ms = delay_ms
+        self.generation = 0
+        self.after_id = None
+        self.burst_start = None
+        self.in_flight = {}
+        self.last_presented = 0
+
+    def request(self, *args):
+        """Request a render of the current state, accepts and ignores trace arguments."""
+        self.generation += 1
+        if self.burst_start is None:
+            self.burst_start = time.perf_counter()
+        if self.after_id is None:
+            self.after_id = self.widget.after(self.delay_ms, self.flush)
+
+    def flush(self):
+        """Render the latest requested generation."""
+        self.after_id = None
+        if self.burst_start is None:
+            return
+        generation = self.generation
+        self.in_flight[generation] = self.burst_start
+        self.burst_start = None
+        self.render(generation)
+
+    def is_current(self, generation):
+        """Return True if no request was made after the given generation."""
+        return generation == self.generation
+
+    def presented(self, generation):
+        """
+        Record that the render of a generation was shown.
+
+        Args:
+            generation (int): The generation that was presented.
+
+        Returns:
+            bool: False if the generation is stale and its result must be discarded.
+        """
+        requested_at = self.in_flight.pop(generation, None)
+        if generation <= self.last_presented:
+            return False
+        self.last_presented = generation
+
+        # Older in-flight generations can never be presented any more
+        for stale in [key for key in self.in_flight if key < generation]:
+            del self.in_flight[stale]
+        if TIMING_ENABLED and requested_at is not None:
+            latency = time.perf_counter() - requested_at
+            timings.record("preview_latency", latency, 0.0, 0)
+        return True
+
+    def cancel(self):
+        """Cancel the pending flush and mark every started render as stale."""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        self.burst_start = None
+        self.in_flight.clear()
+        self.last_presented = self.generation
@@ -0,0 +1,107 @@
+# Standard library imports
+from threading import Condition, Thread
+import queue
+
+# Third-party library imports
+
+# Local imports
+
+# Constants
+POLL_MS = 10
+
+
+class RenderWorker:
+    """
+    RenderWorker runs render jobs on a dedicated thread and hands results to the Tk main thread.
+
+    Jobs are plain callables applied to immutable snapshots (e.g. a WatermarkSpec), so the worker
+    never touches Tk variables or widgets. Only the latest submitted job is kept: a job that has
+    not started when a newer one arrives is dropped. Finished buffers go through a queue that the
+    main thread polls with after() while jobs are outstanding, and on_result is always called on
+    the main thread.
+
+    Parameters:
+        widget (Misc): The widget whose event loop polls the results.
+        on_result (callable): Called as on_result(generation, result, error) on the main thread.
+        poll_ms (int): Polling interval in milliseconds.
+    """
+
+    def __init__(self, widget, on_result, poll_ms=POLL_MS):
+        """
+        Initialize the RenderWorker and start its thread.
+
+        Args:
+            widget (Misc): The widget whose event loop polls the results.
+            on_result (callable): Called as on_result(generation, result, error).
+            poll_ms (int): Polling interval in milliseconds.
+        """
+        self.widget = widget
+        self.on_result = on_result
+        self.poll_ms = poll_ms
+        self.results = queue.Queue()
+        self.condition = Condition()
+        self.pending_job = None
+        self.outstanding = 0
+        self.poll_id = None
+        self.running = True
+
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, generation, function, *args):
+        """
+        Submit a render job, replacing the job waiting to start if any.
+
+        Args:
+            generation (int): The generation the job renders.
+            function (callable): The render function, must not touch Tk.
+            *args: Immutable arguments passed to function.
+        """
+        with self.condition:
+            if self.pending_job is None:
+                self.outstanding += 1
+            self.pending_job = (generation, function, args)
+            self.condition.notify()
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def run(self):
+        """Worker thread loop, renders the latest pending job."""
+        while True:
+            with self.condition:
+                while self.running and self.pending_job is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                generation, function, args = self.pending_job
+                self.pending_job = None
+            try:
+                self.results.put((generation, function(*args), None))
+            except Exception as e:
+                self.results.put((generation, None, e))
+
+    def poll(self):
+        """Deliver finished results on the main thread, polling again while jobs remain."""
+        self.poll_id = None
+        while True:
+            try:
+                generation, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            with self.condition:
+                self.outstanding -= 1
+            self.on_result(generation, result, error)
+        with self.condition:
+            outstanding = self.outstanding
+        if outstanding and self.running:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def close(self):
+        """Stop polling and the worker thread, a running job finishes unobserved."""
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
+        with self.condition:
+            self.running = False
+            self.pending_job = None
+            self.condition.notify()
@@ -1,40 +1,54 @@
 # Standard library imports
 
 # Third-party library imports
-from customtkinter import CTkToplevel, CTkLabel, CTkProgressBar
+from customtkinter import CTkToplevel, CTkLabel, CTkProgressBar, CTkButton
 
 
 # Local imports
+from utils import *
+
+# Constants
+STAGE_LABELS = {
+    "decode": "Decoding image...",
+    "render": "Rendering watermark...",
+    "composite": "Compositing...",
+    "encode": "Encoding...",
+    "write": "Writing file...",
+    "stream": "Writing strips...",
+}
 
 
 class SaveProgressDialog(CTkToplevel):
     """
     SaveProgressDialog class represents a dialog window for displaying saving progress.
 
-    This class extends CTkToplevel and provides a simple dialog with a progress bar
-    to indicate the progress of a saving operation.
+    This class extends CTkToplevel and provides a simple dialog with a determinate progress
+    bar showing the current stage of a saving operation, and a button to cancel it.
 
     Parameters:
         parent (Tk): The parent Tkinter window.
+        on_cancel (callable): Called when the user cancels the save.
         *args, **kwargs: Additional arguments passed to the CTkToplevel constructor.
     """
 
-    def __init__(self, parent, *args, **kwargs):
+    def __init__(self, parent, on_cancel=None, *args, **kwargs):
         """
         Initialize the SaveProgressDialog.
 
         Args:
             parent (Tk): The parent Tkinter widget.
+            on_cancel (callable): Called when the user cancels the save.
             *args, **kwargs: Additional arguments passed to the CTkToplevel constructor.
         """
         CTkToplevel.__init__(self, parent, *args, **kwargs)
         self.parent = parent
+        self.on_cancel = on_cancel
         self.attributes("-topmost", "true")
         self.title("Saving...")
 
         # Set the size and position of the window
         self.window_w = 300
-        self.window_h = 100
+        self.window_h = 140
         self.x = (self.parent.winfo_screenwidth() // 2) - (self.window_w // 2)
         self.y = (self.parent.winfo_screenheight() // 2) - (self.window_h // 2)
         self.geometry(f"{self.window_w}x{self.window_h}+{self.x}+{self.y}")
@@ -43,19 +57,49 @@ class SaveProgressDialog(CTkToplevel):
         self.progress_label = CTkLabel(self, text="Saving in progress...")
         self.progress_label.pack(pady=10)
 
-        self.progress_bar = CTkProgressBar(self)
+        self.progress_bar = CTkProgressBar(self, mode="determinate")
         self.progress_bar.pack(pady=10)
+        self.progress_bar.set(0)
+
+        self.cancel_btn = CTkButton(
+            self,
+            fg_color=GREY,
+            border_color=WHITE,
+            border_width=1,
+            hover_color=TURQUOISE,
+            text_color=WHITE,
+            text="Cancel",
+            command=self.cancel,
+        )
+        self.cancel_btn.pack(pady=5)
 
-    def start(self):
+    def set_progress(self, stage, fraction):
         """
-        Start the progress bar to indicate the beginning of the saving process.
+        Show the current stage and the overall progress of the save.
+
+        Args:
+            stage (str): The save stage name.
+            fraction (float): The overall fraction done, from 0 to 1.
         """
-        self.progress_bar.start()
+        self.progress_label.configure(text=STAGE_LABELS.get(stage, "Saving..."))
+        self.progress_bar.set(fraction)
 
-    def stop(self):
+    def cancel(self):
+        """
+        Ask the save to stop, it ends at its next stage or strip boundary.
         """
-        Stop the progress bar, set it to 100% and update the progress label to indicate completion.
+        self.cancel_btn.configure(state="disabled")
+        self.progress_label.configure(text="Cancelling...")
+        if self.on_cancel:
+            self.on_cancel()
+
+    def stop(self, text="Save Complete!"):
+        """
+        Set the progress bar to 100%, update the progress label and turn Cancel into Close.
+
+        Args:
+            text (str): The final message.
         """
-        self.progress_bar.stop()
-        self.progress_bar.set(100)
-        self.progress_label.configure(text="Save Complete!")
+        self.progress_bar.set(1)
+        self.progress_label.configure(text=text)
+        self.cancel_btn.configure(state="normal", text="Close", command=self.destroy)
@@ -0,0 +1,80 @@
+# Standard library imports
+from threading import Event, Thread
+
+# Third-party library imports
+
+# Local imports
+
+# Constants
+POLL_MS = 50
+
+
+class SaveTask:
+    """
+    SaveTask runs a save on a worker thread and reports its progress on the Tk main thread.
+
+    The worker only stores its latest (stage, fraction) progress; the main thread polls it with
+    after() and forwards changes to on_progress, so no Tk call is made from the worker. Setting
+    the cancel event asks the save to stop at its next stage or strip boundary.
+
+    Parameters:
+        widget (Misc): The widget whose event loop polls the progress.
+        function (callable): The save, called with progress and cancel keyword arguments.
+        on_progress (callable): Called as on_progress(stage, fraction) on the main thread.
+        on_done (callable): Called as on_done(error) on the main thread once the save ended.
+        poll_ms (int): Polling interval in milliseconds.
+    """
+
+    def __init__(self, widget, function, on_progress, on_done, poll_ms=POLL_MS):
+        """
+        Initialize the SaveTask and start its thread.
+
+        Args:
+            widget (Misc): The widget whose event loop polls the progress.
+            function (callable): The save, called with progress and cancel keyword arguments.
+            on_progress (callable): Called as on_progress(stage, fraction).
+            on_done (callable): Called as on_done(error) once the save ended.
+            poll_ms (int): Polling interval in milliseconds.
+        """
+        self.widget = widget
+        self.function = function
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.poll_ms = poll_ms
+        self.cancel_event = Event()
+        self.latest = None
+        self.reported = None
+        self.error = None
+
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def run(self):
+        """Worker thread, runs the save and keeps any error for the main thread."""
+        try:
+            self.function(progress=self.report, cancel=self.cancel_event)
+        except Exception as e:
+            self.error = e
+
+    def report(self, stage, fraction):
+        """Store the latest progress, called on the worker thread."""
+        self.latest = (stage, fraction)
+
+    def poll(self):
+        """Forward progress changes on the main thread until the save ended."""
+        # Read the liveness first so the last progress of a finished save is not missed
+        alive = self.thread.is_alive()
+        latest = self.latest
+        if latest is not None and latest != self.reported:
+            self.reported = latest
+            self.on_progress(*latest)
+        if alive:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+        else:
+            self.poll_id = None
+            self.on_done(self.error)
+
+    def cancel(self):
+        """Ask the save to stop at its next stage or strip boundary."""
+        self.cancel_event.set()
@@ -0,0 +1,117 @@
+# Standard library imports
+
+# Third-party library imports
+
+# Local imports
+from utils import *
+
+# Constants
+REFRESH_MS = 500
+OVERLAY_TAG = "stats_overlay"
+OVERLAY_FONT = ("Courier New", 9)
+OVERLAY_PAD = 6
+
+
+class StatsOverlay:
+    """
+    StatsOverlay shows the stage timing summary in the top left corner of a canvas.
+
+    The text is refreshed with after() while the overlay is shown, and nothing runs while it is
+    hidden. Each line shows a stage, its call count, its median and 95th percentile wall times,
+    its mean CPU time and the mean megabytes of the images it produced.
+
+    Parameters:
+        canvas (Canvas): The canvas the overlay is drawn on.
+        timings (StageTimings): The timing records to summarize.
+        refresh_ms (int): Refresh interval in milliseconds.
+    """
+
+    def __init__(self, canvas, timings, refresh_ms=REFRESH_MS):
+        """
+        Initialize the StatsOverlay, hidden.
+
+        Args:
+            canvas (Canvas): The canvas the overlay is drawn on.
+            timings (StageTimings): The timing records to summarize.
+            refresh_ms (int): Refresh interval in milliseconds.
+        """
+        self.canvas = canvas
+        self.timings = timings
+        self.refresh_ms = refresh_ms
+        self.after_id = None
+        self.background = None
+        self.text = None
+
+    @property
+    def shown(self):
+        return self.text is not None
+
+    def toggle(self):
+        """Show the overlay when it is hidden and hide it otherwise."""
+        if self.shown:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        """Draw the overlay above every canvas item and start refreshing it."""
+        if self.shown:
+            return
+        self.background = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill=DARK, outline="", stipple="gray50", tags=OVERLAY_TAG
+        )
+        self.text = self.canvas.create_text(
+            OVERLAY_PAD,
+            OVERLAY_PAD,
+            anchor="nw",
+            font=OVERLAY_FONT,
+            fill=WHITE,
+            tags=OVERLAY_TAG,
+        )
+        self.refresh()
+
+    def hide(self):
+        """Remove the overlay and stop refreshing it."""
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        self.canvas.delete(OVERLAY_TAG)
+        self.background = None
+        self.text = None
+
+    def refresh(self):
+        """Redraw the summary and schedule the next refresh."""
+        self.canvas.itemconfigure(self.text, text=self.format(self.timings.summary()))
+        x0, y0, x1, y1 = self.canvas.bbox(self.text)
+        self.canvas.coords(
+            self.background,
+            x0 - OVERLAY_PAD,
+            y0 - OVERLAY_PAD,
+            x1 + OVERLAY_PAD,
+            y1 + OVERLAY_PAD,
+        )
+        # Watermark items are created after the overlay, keep it on top
+        self.canvas.tag_raise(OVERLAY_TAG)
+        self.after_id = self.canvas.after(self.refresh_ms, self.refresh)
+
+    @staticmethod
+    def format(summary):
+        """
+        Format a stage timing summary as aligned lines.
+
+        Args:
+            summary (dict): The StageTimings summary.
+
+        Returns:
+            str: The overlay text.
+        """
+        lines = [f"{'stage':<15}{'n':>5}{'p50':>8}{'p95':>8}{'cpu':>8}{'MB':>7}"]
+        for stage, stats in sorted(summary.items()):
+            lines.append(
+                f"{stage:<15}{stats['count']:>5}{stats['p50_ms']:>8.1f}"
+                f"{stats['p95_ms']:>8.1f}{stats['cpu_mean_ms']:>8.1f}"
+                f"{stats['bytes_mean'] / 1e6:>7.1f}"
+            )
+        if not summary:
+            lines.append("no samples yet")
+        return "\n".join(lines)
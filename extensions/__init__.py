@@ -1 +1,2 @@
+from .stall_watchdog import StallWatchdog
 from .main_application import MainApplication
@@ -7,6 +7,7 @@ from tkinterdnd2 import TkinterDnD
 # Local imports
 from utils import DARK
 from views import MainView
+from .stall_watchdog import StallWatchdog
 
 
 class MainApplication(CTk, TkinterDnD.DnDWrapper):
@@ -48,6 +49,9 @@ class MainApplication(CTk, TkinterDnD.DnDWrapper):
         self.geometry(f"{self.window_w}x{self.window_h}+{self.x}+{self.y}")
         self.configure(bg=DARK)
 
+        # Log event loop stalls with the call sites that blocked the main thread
+        self.watchdog = StallWatchdog(self)
+
         self.switch_to_main_view()
 
     def switch_view(self, view_class, *args, **kwargs):
@@ -66,5 +70,10 @@ class MainApplication(CTk, TkinterDnD.DnDWrapper):
         selected_view.pack(fill="both", expand=True)
         self.current_view = selected_view
 
+    def destroy(self):
+        """Stop the stall watchdog and destroy the window."""
+        self.watchdog.stop()
+        super().destroy()
+
     def switch_to_main_view(self):
         self.after(50, lambda: self.switch_view(MainView))
@@ -0,0 +1,159 @@
+# Standard library imports
+from collections import Counter, deque
+from threading import Event, Lock, Thread, get_ident
+import logging
+import os
+import sys
+import time
+import traceback
+
+# Third-party library imports
+
+# Local imports
+from utils import TIMING_ENABLED, timings
+
+# Constants
+HEARTBEAT_MS = 100
+SAMPLE_MS = 50
+STALL_THRESHOLD_MS = 200
+MAX_SAMPLES = 200
+STALL_HISTORY = 50
+STACK_DEPTH = 12
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+logger = logging.getLogger(__name__)
+
+
+def call_site(stack):
+    """
+    Return the innermost frame of a stack that is in the project, outside Tk and Pillow.
+
+    Args:
+        stack (StackSummary): The sampled stack, outermost frame first.
+
+    Returns:
+        str: The frame as "path:line in function", the path relative to the project.
+    """
+    frame = next(
+        (frame for frame in reversed(stack) if frame.filename.startswith(PROJECT_ROOT)),
+        stack[-1],
+    )
+    filename = os.path.relpath(frame.filename, PROJECT_ROOT)
+    if filename.startswith(".."):
+        filename = frame.filename
+    return f"{filename}:{frame.lineno} in {frame.name}"
+
+
+class StallWatchdog:
+    """
+    StallWatchdog measures the latency of the Tk event loop and logs where it stalls.
+
+    The main thread schedules a heartbeat with after() every heartbeat_ms. A sampler thread
+    checks how long ago the last heartbeat ran; once it is overdue by more than threshold_ms the
+    main loop is blocked, and the sampler takes a stack sample of the main thread with
+    sys._current_frames() every sample_ms until the heartbeat runs again. The late heartbeat
+    then logs the stall duration, the project call sites the samples were in and the stack of
+    the first sample. Stalls are also kept in stalls and, with stage timing on, recorded as the
+    "stall" stage.
+
+    Parameters:
+        widget (Misc): A widget of the event loop to watch, created on the main thread.
+        threshold_ms (int): Heartbeat delay above which the loop counts as stalled.
+        heartbeat_ms (int): Heartbeat interval in milliseconds.
+        sample_ms (int): Sampler interval in milliseconds.
+    """
+
+    def __init__(
+        self,
+        widget,
+        threshold_ms=STALL_THRESHOLD_MS,
+        heartbeat_ms=HEARTBEAT_MS,
+        sample_ms=SAMPLE_MS,
+    ):
+        """
+        Initialize the StallWatchdog and start the heartbeat and the sampler thread.
+
+        Args:
+            widget (Misc): A widget of the event loop to watch, created on the main thread.
+            threshold_ms (int): Heartbeat delay above which the loop counts as stalled.
+            heartbeat_ms (int): Heartbeat interval in milliseconds.
+            sample_ms (int): Sampler interval in milliseconds.
+        """
+        self.widget = widget
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.sample_ms = sample_ms
+        self.main_ident = get_ident()
+        self.stalls = deque(maxlen=STALL_HISTORY)
+        self.samples = []
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.next_beat = time.perf_counter() + heartbeat_ms / 1000
+
+        self.thread = Thread(
+            target=self.sample_loop, daemon=True, name="stall-watchdog"
+        )
+        self.thread.start()
+        self.after_id = self.widget.after(self.heartbeat_ms, self.beat)
+
+    def beat(self):
+        """Heartbeat on the main thread, reports the stall when it ran late."""
+        now = time.perf_counter()
+        with self.lock:
+            delay = now - self.next_beat
+            samples = self.samples
+            self.samples = []
+            self.next_beat = now + self.heartbeat_ms / 1000
+        if delay > self.threshold:
+            self.report(delay, samples)
+        self.after_id = self.widget.after(self.heartbeat_ms, self.beat)
+
+    def sample_loop(self):
+        """Sampler thread, samples the main thread stack while the heartbeat is overdue."""
+        while not self.stop_event.wait(self.sample_ms / 1000):
+            with self.lock:
+                overdue = time.perf_counter() - self.next_beat > self.threshold
+                if not overdue or len(self.samples) >= MAX_SAMPLES:
+                    continue
+            frame = sys._current_frames().get(self.main_ident)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self.lock:
+                self.samples.append(stack)
+
+    def report(self, delay, samples):
+        """
+        Log a stall and keep its record.
+
+        Args:
+            delay (float): How late the heartbeat ran, in seconds.
+            samples (list): The main thread stacks sampled during the stall.
+        """
+        call_sites = Counter(call_site(stack) for stack in samples)
+        stall = {
+            "time": time.time(),
+            "duration_ms": 1000 * delay,
+            "samples": len(samples),
+            "call_sites": call_sites.most_common(),
+        }
+        self.stalls.append(stall)
+        if TIMING_ENABLED:
+            timings.record("stall", delay, 0.0, 0)
+
+        message = f"Tk main loop stalled for {stall['duration_ms']:.0f} ms"
+        if samples:
+            sites = ", ".join(
+                f"{site} ({count})" for site, count in call_sites.most_common(5)
+            )
+            stack = "".join(traceback.format_list(samples[0][-STACK_DEPTH:]))
+            message += f"; call sites by samples: {sites}\n{stack}"
+        logger.warning(message.rstrip())
+
+    def stop(self):
+        """Stop the heartbeat and the sampler thread."""
+        self.stop_event.set()
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
@@ -4,8 +4,14 @@ from .constants import (
     GREY,
     TURQUOISE,
     WHITE,
+    RED,
     FILE_TYPES,
+    LAYOUT_FILE_TYPES,
     RESAMPLE_METHOD,
     WATERMARK_TAG,
     BASE_SIZE,
+    STREAMING_MIN_PIXELS,
 )
+from .paths import get_cache_dir
+from .stats import summarize_ms
+from .timing import timed, timings, enabled as TIMING_ENABLED
@@ -7,13 +7,17 @@ GREY = "#393E46"
 TURQUOISE = "#00ADB5"
 DARK_TURQUOISE = "#00959C"
 WHITE = "#EEEEEE"
+RED = "#E84545"
 
 FILE_TYPES = (
     ("PNG files", "*.png"),
     ("BMP files", "*.bmp"),
     ("JPEG files", "*.jpeg"),
+    ("WebP files", "*.webp"),
     ("All files", "*.*"),
 )
+LAYOUT_FILE_TYPES = (("Watermark layouts", "*.json"),)
 RESAMPLE_METHOD = Image.BICUBIC
 WATERMARK_TAG = "watermark"
 BASE_SIZE = 60
+STREAMING_MIN_PIXELS = 40_000_000
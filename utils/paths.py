@@ -0,0 +1,25 @@
+# Standard library imports
+import os
+import sys
+
+# Third-party library imports
+
+# Local imports
+
+
+def get_cache_dir():
+    """
+    Return the per-user cache directory of the application, creating it if needed.
+
+    Returns:
+        str: The cache directory path.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    cache_dir = os.path.join(base, "watermarker")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,27 @@
+# Standard library imports
+
+# Third-party library imports
+
+# Local imports
+
+
+def summarize_ms(samples):
+    """
+    Summarize durations in seconds as milliseconds.
+
+    Args:
+        samples (iterable): Durations in seconds.
+
+    Returns:
+        dict: count, and mean/p50/p95/max in milliseconds when there are samples.
+    """
+    samples = sorted(samples)
+    summary = {"count": len(samples)}
+    if samples:
+        summary.update(
+            mean_ms=1000 * sum(samples) / len(samples),
+            p50_ms=1000 * samples[len(samples) // 2],
+            p95_ms=1000 * samples[int(len(samples) * 0.95)],
+            max_ms=1000 * samples[-1],
+        )
+    return summary
@@ -0,0 +1,166 @@
+# Standard library imports
+from collections import deque
+from functools import wraps
+from threading import Lock, current_thread
+import json
+import os
+import time
+
+# Third-party library imports
+
+# Local imports
+from .stats import summarize_ms
+
+TIMING_ENV = "WATERMARKER_TIMING"
+TIMING_SAMPLES = 1000
+
+# Read once at import: with timing off the decorators return the functions unchanged
+enabled = os.environ.get(TIMING_ENV, "") not in ("", "0")
+
+
+def result_nbytes(result):
+    """
+    Return the pixel buffer size of the images a stage returned.
+
+    Pillow allocates pixel buffers outside the Python allocator, so the images a stage
+    produces are the measure of the memory it allocated.
+
+    Args:
+        result: The stage result, an Image, a tuple or list holding images, or anything else.
+
+    Returns:
+        int: The total buffer size of the images in bytes.
+    """
+    if isinstance(result, (tuple, list)):
+        return sum(result_nbytes(item) for item in result)
+    if hasattr(result, "getbands") and hasattr(result, "size"):
+        width, height = result.size
+        return width * height * len(result.getbands())
+    return 0
+
+
+class StageTimings:
+    """
+    StageTimings keeps the most recent timing records of every instrumented stage.
+
+    A record holds the wall time, the CPU time of the calling thread and the bytes of the images
+    the stage produced. Records are kept in a bounded buffer and can be summarized per stage or
+    exported as JSON lines.
+
+    Parameters:
+        max_records (int): Number of records kept, older ones are dropped.
+    """
+
+    def __init__(self, max_records=TIMING_SAMPLES):
+        """
+        Initialize the StageTimings.
+
+        Args:
+            max_records (int): Number of records kept, older ones are dropped.
+        """
+        self.records = deque(maxlen=max_records)
+        self.lock = Lock()
+
+    def record(self, stage, wall, cpu, nbytes):
+        """
+        Add a timing record.
+
+        Args:
+            stage (str): The stage name.
+            wall (float): Wall time in seconds.
+            cpu (float): CPU time of the calling thread in seconds.
+            nbytes (int): Bytes of the images the stage produced.
+        """
+        entry = {
+            "stage": stage,
+            "time": time.time(),
+            "wall_ms": 1000 * wall,
+            "cpu_ms": 1000 * cpu,
+            "bytes": nbytes,
+            "thread": current_thread().name,
+        }
+        with self.lock:
+            self.records.append(entry)
+
+    def summary(self):
+        """
+        Summarize the records of each stage.
+
+        Returns:
+            dict: By stage, the wall time summary of summarize_ms plus the mean CPU time and
+            the mean bytes.
+        """
+        with self.lock:
+            records = list(self.records)
+        stages = {}
+        for entry in records:
+            stages.setdefault(entry["stage"], []).append(entry)
+        summary = {}
+        for stage, entries in stages.items():
+            stage_summary = summarize_ms(entry["wall_ms"] / 1000 for entry in entries)
+            stage_summary["cpu_mean_ms"] = sum(e["cpu_ms"] for e in entries) / len(entries)
+            stage_summary["bytes_mean"] = sum(e["bytes"] for e in entries) / len(entries)
+            summary[stage] = stage_summary
+        return summary
+
+    def export(self, path):
+        """
+        Append the records to a JSON lines file, one record per line.
+
+        Args:
+            path (str): The output file path.
+
+        Returns:
+            int: The number of records written.
+        """
+        with self.lock:
+            records = list(self.records)
+        with open(path, "a", encoding="utf-8") as file:
+            for entry in records:
+                file.write(json.dumps(entry) + "\n")
+        return len(records)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+
+# The records of every instrumented stage in this process
+timings = StageTimings()
+
+
+def timed(stage):
+    """
+    Decorate a function to record its wall time, CPU time and produced bytes as a stage.
+
+    Timing is switched on by the WATERMARKER_TIMING environment variable when the module is
+    first imported. Otherwise the function is returned as is, so instrumented hot paths cost
+    nothing.
+
+    Args:
+        stage (str): The stage name.
+
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorate(function):
+        if not enabled:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            result = function(*args, **kwargs)
+            timings.record(
+                stage,
+                time.perf_counter() - wall_start,
+                time.thread_time() - cpu_start,
+                result_nbytes(result),
+            )
+            return result
+
+        return wrapper
+
+    return decorate
@@ -1,2 +1,10 @@
-from .canvas_view import CanvasView
 from .main_view import MainView
+
+
+def __getattr__(name):
+    # CanvasView pulls in the render core, so it is imported on first use
+    if name == "CanvasView":
+        from .canvas_view import CanvasView
+
+        return CanvasView
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
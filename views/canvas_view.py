@@ -1,16 +1,46 @@
 # Standard library imports
-from itertools import product
-from tkinter import filedialog, Canvas
-from threading import Thread
+from tkinter import filedialog, messagebox, Canvas
+import logging
+import os
 
 # Third-party library imports
 from customtkinter import CTkFrame
-from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageColor
-from matplotlib import font_manager
+from PIL import Image, ImageTk
+from tkinterdnd2 import DND_FILES
 
 # Local imports
 from utils import *
-from components import NavBar, Properties, SaveProgressDialog
+from watermarker import (
+    RenderPipeline,
+    load_watermark_image,
+    save_image,
+    streaming_supported,
+    SaveCancelled,
+    fit_size,
+    oriented_size,
+    decode_preview,
+)
+from components import (
+    NavBar,
+    Properties,
+    SaveProgressDialog,
+    RenderScheduler,
+    RenderWorker,
+    PhotoPresenter,
+    SaveTask,
+    BatchQueue,
+    BatchProgressDialog,
+    StatsOverlay,
+)
+
+# Constants
+DRAFT_LOD = 2
+IDLE_REFINE_MS = 250
+STALE_TAG = "stale_preview"
+STALE_FONT = ("Arial", 11, "bold")
+STALE_PAD = 8
+
+logger = logging.getLogger(__name__)
 
 
 class CanvasView(CTkFrame):
@@ -25,10 +55,13 @@ class CanvasView(CTkFrame):
         parent (Tk): The parent Tkinter window.
         switch_view (function): Function to switch views.
         bg_image_path (str): Path to the background image file.
+        batch_paths (list): Image files queued for a batch run with the current watermark.
         *args, **kwargs: Additional arguments passed to the CTkFrame constructor.
     """
 
-    def __init__(self, parent, switch_view, bg_image_path=None, *args, **kwargs):
+    def __init__(
+        self, parent, switch_view, bg_image_path=None, batch_paths=None, *args, **kwargs
+    ):
         """
         Initialize the CanvasView.
 
@@ -36,12 +69,14 @@ class CanvasView(CTkFrame):
             parent (Tk): The parent Tkinter widget.
             switch_view (callable): Function to switch views.
             bg_image_path (str): Path to the background image file.
+            batch_paths (list): Image files queued for a batch run with the current watermark.
             *args, **kwargs: Additional arguments passed to the CTkFrame constructor.
         """
         CTkFrame.__init__(self, parent, *args, **kwargs)
         self.switch_view = switch_view
         self.parent = parent
         self.bg_image_path = bg_image_path
+        self.batch_paths = list(batch_paths or [])
 
         # Get window Size
         self.window_w = self.parent.winfo_width()
@@ -52,8 +87,13 @@ class CanvasView(CTkFrame):
         self.canvas_frame_h = int(self.window_h * 0.9)
 
         # Variables Initiation
-        self.font_cache = {}
         self.watermark = None
+        self.properties = None
+        self.render_scheduler = RenderScheduler(self, self.update_watermark)
+        self.render_worker = RenderWorker(self, self.on_render_result)
+        self.interactive = False
+        self.refine_after_id = None
+        self.render_error = None
 
         # Initiate Navigation Bar
         self.navbar = NavBar(self)
@@ -84,36 +124,57 @@ class CanvasView(CTkFrame):
             WATERMARK_TAG, "<ButtonRelease-1>", self.on_watermark_release
         )
 
+        # With WATERMARKER_TIMING set, F3 toggles the stage timing overlay and F4 exports it
+        if TIMING_ENABLED:
+            self.stats_overlay = StatsOverlay(self.canvas, timings)
+            window = self.winfo_toplevel()
+            window.bind("<F3>", lambda event: self.stats_overlay.toggle())
+            window.bind("<F4>", lambda event: self.export_timings())
+
+        # Files dropped on the canvas are queued for a batch run
+        self.canvas.drop_target_register(DND_FILES)
+        self.canvas.dnd_bind("<<Drop>>", self.queue_dropped_files)
+
+    def destroy(self):
+        """
+        Cancel pending renders and destroy the view.
+        """
+        if self.refine_after_id is not None:
+            self.after_cancel(self.refine_after_id)
+        self.render_scheduler.cancel()
+        self.render_worker.close()
+        if TIMING_ENABLED:
+            self.stats_overlay.hide()
+            self.winfo_toplevel().unbind("<F3>")
+            self.winfo_toplevel().unbind("<F4>")
+        CTkFrame.destroy(self)
+
+    @timed("first_preview")
     def get_bg_image(self):
         """
         Load and preprocess the background image.
+
+        Only a reduced-scale preview is decoded here, the full resolution frame is decoded
+        at save time. With stage timing on, the time to first preview is recorded as the
+        "first_preview" stage.
         """
-        # Open the image file with Pillow and convert it to PhotoImage
+        # Open the image file with Pillow, only the header is read at this point
         with Image.open(self.bg_image_path) as pil_img:
-            self.org_bg_img = pil_img.copy()
-            pil_img_w, pil_img_h = pil_img.size
-            self.canvas_w, self.canvas_h = pil_img.size
-
-            # Check if the image is already contained in the canvas
-            if pil_img_w <= self.canvas_frame_w and pil_img_h <= self.canvas_frame_h:
-                pass  # Return the original image
-            else:
-                # Calculate the aspect ratios
-                img_aspect_ratio = pil_img_w / pil_img_h
-                canvas_aspect_ratio = self.canvas_frame_w / self.canvas_frame_h
-
-                # Calculate the new size to fit within the canvas while maintaining the aspect ratio
-                if img_aspect_ratio > canvas_aspect_ratio:
-                    self.canvas_w = self.canvas_frame_w
-                    self.canvas_h = int(self.canvas_frame_w / img_aspect_ratio)
-                else:
-                    self.canvas_w = int(self.canvas_frame_h * img_aspect_ratio)
-                    self.canvas_h = self.canvas_frame_h
-
-            # Resize the image
-            pil_img = pil_img.resize((self.canvas_w, self.canvas_h))
+            # Sizes are upright, as the image is shown and saved
+            pil_img_w, pil_img_h = oriented_size(pil_img)
+
+            # Large backgrounds are streamed from disk at save time when the formats allow it
+            self.is_large = pil_img_w * pil_img_h >= STREAMING_MIN_PIXELS
+
+            # Calculate the size to fit within the canvas while maintaining the aspect ratio
+            self.canvas_w, self.canvas_h = fit_size(
+                (pil_img_w, pil_img_h), (self.canvas_frame_w, self.canvas_frame_h)
+            )
             self.bg_img_resize_ratio = pil_img_w / self.canvas_w
 
+            # Decode at a reduced scale and resize the image
+            pil_img = decode_preview(pil_img, (self.canvas_w, self.canvas_h))
+
             # Create TkImage object of bg image
             self.bg_img = ImageTk.PhotoImage(
                 image=pil_img, height=self.canvas_h, width=self.canvas_w
@@ -132,149 +193,190 @@ class CanvasView(CTkFrame):
             highlightthickness=0,
         )
         self.canvas.pack(pady=self.window_h * 0.04)
+        self.presenter = PhotoPresenter(self.canvas, WATERMARK_TAG)
 
-    def insert_watermark_to_canvas(self):
+    @timed("present")
+    def insert_watermark_to_canvas(self, spec):
         """
         Insert the watermark into the Canvas widget.
-        """
-        # Create Tk Image from the PIL Image
-        self.text_watermark_image = ImageTk.PhotoImage(image=self.watermark_pil_img)
 
-        # Change the watermark object image if exists or create a new one if not
-        if self.watermark:
-            self.canvas.itemconfig(
-                WATERMARK_TAG,
-                image=self.text_watermark_image,
+        The watermark PhotoImage is reused and updated in place while the rendered size stays
+        the same, copying only the region whose pixels changed. Tiled modes place the single tile
+        at every lattice position as separate canvas items sharing that PhotoImage instead of
+        showing one grid image.
+
+        Args:
+            spec (WatermarkSpec): The snapshot the watermark was rendered from.
+        """
+        if spec.tile == "Single":
+            self.watermark = self.presenter.present(
+                self.watermark_pil_img, self.watermark_center
             )
-            1
         else:
-            self.watermark = self.canvas.create_image(
-                (self.drag_data["x"], self.drag_data["y"]),
-                image=self.text_watermark_image,
-                tag=WATERMARK_TAG,
+            self.watermark = self.presenter.present_tiled(
+                self.watermark_pil_img,
+                self.watermark_center,
+                int(spec.tile_gap),
+                (self.canvas_w, self.canvas_h),
+                diamond=spec.tile == "Multiple Diamond",
             )
-            1
-
-    def update_text_watermark(self):
-        """
-        Update the watermark image with text properties.
-        """
-        # Set properties variables
-        text = self.properties.text.get()
-        color = ImageColor.getcolor(self.properties.color.get(), "RGB")  # RGB color
-        opacity = int(self.properties.opacity.get() * 255 / 100)
-        rotation = self.properties.rotation.get()
-        size = int(self.properties.size.get() * BASE_SIZE)
-        font_family = self.properties.font.get()
-        tile = self.properties.tile.get()
-        tile_gap = self.properties.tile_gap.get()
-        font_weight = "bold"
-
-        # Create or reuse the font
-        font_key = (font_family, font_weight, size)
-        if font_key not in self.font_cache:
-            self.font_cache[font_key] = ImageFont.truetype(
-                font=font_manager.findfont(
-                    font_manager.FontProperties(family=font_family, weight=font_weight)
-                ),
-                size=size,
-            )
-        font = self.font_cache[font_key]
 
-        # Get text image size (hight set to double because of inaccuracy of getbbox method)
-        text_bbox = font.getbbox(text)
-        text_image_size = (
-            text_bbox[2] - text_bbox[0],
-            (text_bbox[3] - text_bbox[1]) * 2,
-        )
+    def get_watermark_spec(self):
+        """
+        Snapshot the current properties and watermark position.
 
-        # Create PIL image
-        self.watermark_pil_img = Image.new("RGBA", text_image_size, (0, 0, 0, 0))
-
-        # Create ImageDraw object
-        draw = ImageDraw.Draw(self.watermark_pil_img)
-
-        # Draw the text on the image with the given parameters
-        draw.text(
-            (text_image_size[0] / 2, text_image_size[1] / 2),
-            text,
-            font=font,
-            fill=color + (opacity,),
-            stroke_width=1,
-            stroke_fill=color + (opacity,),
-            anchor="mm",
-            align="center",
+        Returns:
+            WatermarkSpec: The watermark settings in preview pixels.
+        """
+        x, y = self.watermark_center
+        return self.properties.get_spec().evolve(
+            image_path=getattr(self, "watermark_img_path", None),
+            position=(x / self.canvas_w, y / self.canvas_h),
         )
-        # Get the alpha channel
-        alpha = self.watermark_pil_img.split()[-1]
 
-        # Calculate the bounding box based on the alpha channel
-        bbox = alpha.getbbox()
-        self.watermark_pil_img = self.watermark_pil_img.crop(bbox)
+    def update_watermark(self, generation):
+        """
+        Submit a render of the current properties to the render worker.
 
-        # Rotate the Text based on the rotation property
-        self.watermark_pil_img = self.watermark_pil_img.rotate(
-            rotation, expand=True, resample=RESAMPLE_METHOD
-        )
+        The properties are snapshotted here, on the main thread, so the worker never reads Tk
+        variables. Only the render stages whose inputs changed are recomputed by the pipeline.
+        While a slider moves the low-resolution draft pipeline is used, and a full-quality
+        render follows once the slider is released or stays idle for IDLE_REFINE_MS.
 
-        # Check Tile property and initiate the proper Tile configuration
-        if tile != "Single":
-            if tile == "Multiple Square":
-                tile_diamond = False
-            else:
-                tile_diamond = True
-            self.watermark_pil_img = self.create_img_grid(
-                self.watermark_pil_img, tile_gap, tile_diamond
+        Args:
+            generation (int): The render scheduler generation.
+        """
+        spec = self.get_watermark_spec()
+        if self.interactive:
+            self.render_worker.submit(
+                generation, self.render_draft, self.draft_pipeline, spec
             )
+        else:
+            self.render_worker.submit(generation, self.render_full, self.pipeline, spec)
 
-        # Insert the watermark into the canvas
-        self.insert_watermark_to_canvas()
+        if self.interactive:
+            if self.refine_after_id is not None:
+                self.after_cancel(self.refine_after_id)
+            self.refine_after_id = self.after(
+                IDLE_REFINE_MS, lambda: self.set_interactive(False)
+            )
 
-    def update_image_watermark(self):
-        """
-        Update the watermark image with image properties.
+    @staticmethod
+    @timed("preview_render_draft")
+    def render_draft(pipeline, spec):
         """
-        # Create a copy of the original image
-        self.watermark_pil_img = self.org_watermark_pil_img.copy()
+        Render the draft preview tile of a snapshot, runs on the render worker.
 
-        # Set properties variables
-        opacity = int(self.properties.opacity.get() * 255 / 100)
-        rotation = self.properties.rotation.get()
-        size = int(self.properties.size.get() * BASE_SIZE)
-        tile = self.properties.tile.get()
-        tile_gap = self.properties.tile_gap.get()
+        Returns:
+            tuple: The snapshot and its single watermark.
+        """
+        return spec, pipeline.render_tile(spec)
 
-        # Get image size, as set the hight to the size property
-        img_w, img_h = self.watermark_pil_img.size
-        img_size = (int(size * img_w / img_h), size)
+    @staticmethod
+    @timed("preview_render_full")
+    def render_full(pipeline, spec):
+        """
+        Render the full-quality preview tile of a snapshot, runs on the render worker.
 
-        # resize the image to the selected size
-        self.watermark_pil_img = self.watermark_pil_img.resize(img_size)
+        Returns:
+            tuple: The snapshot and its single watermark.
+        """
+        return spec, pipeline.render_tile(spec)
 
-        # Make all opaque pixels into semi-opaque based on opacity property
-        A = self.watermark_pil_img.getchannel("A")
-        newA = A.point(lambda i: opacity if i > 0 else 0)
+    def set_interactive(self, interactive):
+        """
+        Switch between draft renders during slider motion and full-quality renders.
 
-        # set the Image Opacity
-        self.watermark_pil_img.putalpha(newA)
+        Leaving interactive mode requests the full-quality refine render.
 
-        # set the Image rotation
-        self.watermark_pil_img = self.watermark_pil_img.rotate(
-            rotation, expand=True, resample=RESAMPLE_METHOD
+        Args:
+            interactive (bool): True while a slider is being dragged.
+        """
+        if self.refine_after_id is not None:
+            self.after_cancel(self.refine_after_id)
+            self.refine_after_id = None
+        if self.interactive and not interactive:
+            self.interactive = False
+            self.render_scheduler.request()
+        self.interactive = interactive
+
+    def export_timings(self):
+        """
+        Append the recorded stage timings to a JSON lines file chosen by the user.
+        """
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".jsonl", filetypes=(("JSON lines", "*.jsonl"),)
         )
+        if file_path:
+            timings.export(file_path)
 
-        # Check Tile property and initiate the proper Tile configuration
-        if tile != "Single":
-            if tile == "Multiple Square":
-                is_diamond = False
-            else:
-                is_diamond = True
-            self.watermark_pil_img = self.create_img_grid(
-                self.watermark_pil_img, tile_gap, is_diamond
-            )
+    def on_render_result(self, generation, result, error):
+        """
+        Present a finished render on the main thread.
+
+        Args:
+            generation (int): The render scheduler generation of the result.
+            result (tuple): The rendered snapshot and its single watermark.
+            error (Exception): The error raised by the render, if any.
+        """
+        if error:
+            logger.error("Watermark preview render failed", exc_info=error)
+
+        # Discard the result if a newer render was already presented
+        if not self.render_scheduler.presented(generation):
+            return
+        if error:
+            self.show_render_error(error)
+            return
+        spec, self.watermark_pil_img = result
+        self.clear_render_error()
 
         # Insert the watermark into the canvas
-        self.insert_watermark_to_canvas()
+        self.insert_watermark_to_canvas(spec)
+
+    def show_render_error(self, error):
+        """
+        Mark the watermark on the canvas as stale and report a failed render.
+
+        The previous frame, if any, stays on the canvas with a "Preview out of date" label and
+        the Properties window stays open, so the watermark can still be edited or removed. The
+        error is shown once, not again for every render of a slider drag that fails the same way.
+
+        Args:
+            error (Exception): The error raised by the render.
+        """
+        self.canvas.delete(STALE_TAG)
+        self.canvas.create_text(
+            self.canvas_w - STALE_PAD,
+            STALE_PAD,
+            anchor="ne",
+            text="Preview out of date",
+            font=STALE_FONT,
+            fill=RED,
+            tags=STALE_TAG,
+        )
+        if str(error) != self.render_error:
+            self.render_error = str(error)
+            messagebox.showerror(
+                title="Preview Failed",
+                message=f"The watermark could not be rendered: {error}",
+            )
+
+    def clear_render_error(self):
+        """Remove the stale mark once a render succeeds."""
+        if self.render_error is not None:
+            self.render_error = None
+            self.canvas.delete(STALE_TAG)
+
+    @property
+    def has_watermark(self):
+        """
+        True while a watermark is being edited.
+
+        Decided by the live Properties window rather than the canvas items, which only exist
+        once the first render was presented.
+        """
+        return self.properties is not None
 
     def initiate_watermark(self, is_text):
         """
@@ -286,29 +388,64 @@ class CanvasView(CTkFrame):
         # Reset the drag date to the center of the canvas
         self.drag_data["x"] = int(self.canvas_w / 2)
         self.drag_data["y"] = int(self.canvas_h / 2)
+        self.watermark_center = (self.drag_data["x"], self.drag_data["y"])
+
+        # Decode the logo first, an unreadable file leaves the current watermark as it is
+        logo = None
+        if not is_text:
+            try:
+                logo = load_watermark_image(self.watermark_img_path)
+            except OSError as e:
+                messagebox.showerror(title="Invalid logo", message=str(e))
+                return
+            self.org_watermark_pil_img = logo
 
         # Check if a watermark exists, if so remove it
-        if self.watermark:
+        if self.has_watermark:
             self.remove_watermark()
 
         # Initiate new properties object
         self.properties = Properties(self, is_text)
-
-        # Initiate the proper watermark Text/Image
-        if is_text:
-            self.update_text_watermark()
-        else:
-            with Image.open(self.watermark_img_path) as image:
-                self.org_watermark_pil_img = image.convert("RGBA")
-            self.update_image_watermark()
+        self.pipeline = RenderPipeline(logo)
+        self.draft_pipeline = RenderPipeline(logo, lod=DRAFT_LOD)
+        self.render_scheduler.request()
 
     def remove_watermark(self):
         """
         Remove the current watermark from the canvas.
         """
-        self.canvas.delete(self.watermark)
+        self.set_interactive(False)
+        self.render_scheduler.cancel()
+        self.presenter.clear()
+        self.clear_render_error()
         self.watermark = None
         self.properties.destroy()
+        self.properties = None
+
+    def apply_layout(self, layout):
+        """
+        Place a watermark from a resolution-independent layout on the background.
+
+        The watermark is recreated when the layout is of another kind or uses another logo.
+
+        Args:
+            layout (WatermarkLayout): The layout to place.
+        """
+        spec = layout.to_spec((self.canvas_w, self.canvas_h))
+        current = self.get_watermark_spec() if self.has_watermark else None
+        if (
+            current is None
+            or current.is_text != spec.is_text
+            or current.image_path != spec.image_path
+        ):
+            if not spec.is_text:
+                self.watermark_img_path = spec.image_path
+            self.initiate_watermark(spec.is_text)
+
+        self.properties.set_spec(spec)
+        x, y = spec.position
+        self.watermark_center = (x * self.canvas_w, y * self.canvas_h)
+        self.render_scheduler.request()
 
     def on_watermark_click(self, event):
         """
@@ -330,6 +467,8 @@ class CanvasView(CTkFrame):
 
             # Update the watermark text position with the offset
             self.canvas.move(WATERMARK_TAG, dx, dy)
+            x, y = self.watermark_center
+            self.watermark_center = (x + dx, y + dy)
 
             # Update the drag_data for the next iteration
             self.drag_data["x"] = event.x
@@ -339,84 +478,165 @@ class CanvasView(CTkFrame):
         """
         Handle the event when the user releases the mouse button after moving the watermark.
         """
+        # A tiled lattice only covers the canvas from where it was laid out, present it again
+        # around the new center; the cached pipeline stages make this a re-layout only
+        if self.drag_data["item"] == WATERMARK_TAG:
+            self.render_scheduler.request()
+
         # Reset the drag_data when the mouse button is released
         self.drag_data["item"] = None
 
-    def create_img_grid(self, image, gap, diamond=False):
+    def create_output_img(self, file_path, spec, progress=None, cancel=None):
         """
-        Create a grid of images with a specified gap between them.
+        Create the final output image by combining the background and watermark images.
 
-        Args:
-            image (Image): The PIL Image to create a grid from.
-            gap (int): The gap between images in pixels.
-            diamond (bool): True if the grid should have a diamond pattern.
+        Runs on the save thread. The watermark is re-rendered from the properties snapshot at the
+        resolution of the original background instead of upscaling the preview raster.
 
-        Returns:
-            Image: The resulting PIL Image grid.
+        Args:
+            file_path (str): The output file path.
+            spec (WatermarkSpec): The watermark snapshot, None to save the background only.
+            progress (callable): Called as progress(stage, fraction).
+            cancel (Event): Once set, the save stops at its next stage or strip boundary.
         """
-        # Get image size and calculate rows and columns number
-        img_width, img_height = image.size
-        rows = int(self.canvas_h / (img_height + gap)) + 3
-        cols = int(self.canvas_w / (img_width + gap)) + 3
+        logo = None if spec is None or spec.is_text else self.org_watermark_pil_img
+        save_image(
+            self.bg_image_path,
+            file_path,
+            spec,
+            logo,
+            scale=self.bg_img_resize_ratio,
+            streaming=self.is_large
+            and streaming_supported(self.bg_image_path, file_path),
+            progress=progress,
+            cancel=cancel,
+        )
 
-        # Create a blank image
-        img_grid = Image.new(
-            "RGBA", (cols * (img_width + gap), rows * (img_height + gap)), (0, 0, 0, 0)
+    def save_img(self):
+        # Ask the user for the file name and location
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".png", filetypes=FILE_TYPES
         )
-        # Paste the same image onto the blank image with the specified gap
 
-        for row, col in product(range(rows), range(cols)):
-            x = col * (img_width + gap)
-            y = row * (img_height + gap)
+        # Check if the user clicked "Cancel" do nothing
+        if file_path:
+            # Create the progress dialog, its Cancel button stops the save
+            self.progress_dialog = SaveProgressDialog(
+                self.parent, on_cancel=lambda: self.save_task.cancel()
+            )
 
-            # Add horizontal offset for odd rows if set to diamond
-            if diamond and row % 2 == 1:
-                x += (img_width + gap) // 2
+            # Snapshot the properties on the main thread, then save in a thread
+            spec = self.get_watermark_spec() if self.has_watermark else None
+            self.save_task = SaveTask(
+                self,
+                lambda **kwargs: self.create_output_img(file_path, spec, **kwargs),
+                self.on_save_progress,
+                self.on_save_done,
+            )
 
-            img_grid.paste(image, (x, y))
+    def on_save_progress(self, stage, fraction):
+        """
+        Show the save progress, called on the main thread.
 
-        return img_grid
+        Args:
+            stage (str): The save stage name.
+            fraction (float): The overall fraction done.
+        """
+        self.progress_dialog.set_progress(stage, fraction)
 
-    def create_output_img(self, file_path):
+    def on_save_done(self, error):
         """
-        Create the final output image by combining the background and watermark images.
+        Show the outcome of the save, called on the main thread.
+
+        Args:
+            error (Exception): The error that ended the save, None if it completed.
         """
+        if isinstance(error, SaveCancelled):
+            self.progress_dialog.stop("Save Cancelled")
+        elif error:
+            self.progress_dialog.stop(f"Save Failed: {error}")
+        else:
+            self.progress_dialog.stop()
 
-        pil_img = self.watermark_pil_img.copy()
-        w, h = pil_img.size
+    def queue_dropped_files(self, event):
+        """
+        Event handler for the drop event. Queue the dropped files for a batch run.
 
-        # Resize the watermark image to fit the original background image
-        pil_img = self.watermark_pil_img.resize(
-            (int(w * self.bg_img_resize_ratio), int(h * self.bg_img_resize_ratio)),
-            resample=RESAMPLE_METHOD,
-        )
-        w_new, h_new = pil_img.size
-        bg_pil_img = self.org_bg_img.copy()
+        Args:
+            event (tkinter.Event): The drop event.
+        """
+        for file_path in self.tk.splitlist(event.data):
+            if file_path not in self.batch_paths:
+                self.batch_paths.append(file_path)
+        self.navbar.set_batch_count(len(self.batch_paths))
 
-        # Set the coordinates to pate the watermark
-        img_cord = self.canvas.coords(WATERMARK_TAG)
-        x = int(img_cord[0] * self.bg_img_resize_ratio - w_new / 2)
-        y = int(img_cord[1] * self.bg_img_resize_ratio - h_new / 2)
+    def start_batch(self):
+        """
+        Apply the current watermark to every queued file on a background process pool.
 
-        # Paste the watermark into the background
-        bg_pil_img.paste(pil_img, (x, y), pil_img)
+        Files are chosen with a dialog when none were dropped. The watermark keeps its relative
+        position and its share of the short edge of each image, and images of dropped folders
+        keep their relative path under the output folder.
+        """
+        if not self.has_watermark:
+            messagebox.showinfo(
+                title="No watermark", message="Add a text or logo watermark first."
+            )
+            return
 
-        # Save the image
-        bg_pil_img.save(file_path)
-        self.progress_dialog.stop()
+        paths = self.batch_paths or list(
+            filedialog.askopenfilenames(title="Select images", filetypes=FILE_TYPES)
+        )
+        if not paths:
+            return
+        output_dir = filedialog.askdirectory(title="Select output folder")
+        if not output_dir:
+            return
+
+        # Import the batch helpers on first use, they pull in the process pool machinery
+        from watermarker.batch import batch_jobs
+
+        # Expand the folders first, so every collected file is checked against the output
+        try:
+            jobs = batch_jobs(paths, output_dir)
+        except ValueError as e:
+            messagebox.showerror(title="Batch not started", message=f"Cannot start: {e}.")
+            return
+        if not jobs:
+            messagebox.showinfo(title="No images", message="No image files were found.")
+            return
+
+        self.batch_dialog = BatchProgressDialog(
+            self.parent,
+            [path for path, _ in jobs],
+            on_cancel=lambda: self.batch_queue.cancel(),
+        )
 
-    def save_img(self):
-        # Ask the user for the file name and location
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".png", filetypes=FILE_TYPES
+        # Snapshot the properties on the main thread, the app window polls the results so the
+        # batch keeps running when the view is left
+        self.batch_queue = BatchQueue(
+            self.parent,
+            self.get_watermark_spec(),
+            paths,
+            output_dir,
+            self.batch_dialog.file_done,
+            self.on_batch_done,
+            reference_size=(self.canvas_w, self.canvas_h),
         )
+        self.batch_paths = []
+        self.navbar.set_batch_count(0)
 
-        # Check if the user clicked "Cancel" do nothing
-        if file_path:
-            # Create and start the progress bar
-            self.progress_dialog = SaveProgressDialog(self.parent)
-            self.progress_dialog.start()
+    def on_batch_done(self, stats, error):
+        """
+        Show the outcome of the batch, called on the main thread.
 
-            # Run the save process in a thread
-            save_thread = Thread(target=self.create_output_img, args=(file_path,))
-            save_thread.start()
+        Args:
+            stats (BatchStats): Throughput figures of the run, None if it failed.
+            error (Exception): The error that ended the batch, None if it completed.
+        """
+        if error:
+            self.batch_dialog.stop(f"Batch Failed: {error}")
+        elif self.batch_queue.cancel_event.is_set():
+            self.batch_dialog.stop(f"Batch Cancelled: {stats.images} images saved")
+        else:
+            self.batch_dialog.stop(stats.summary())
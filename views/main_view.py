@@ -9,7 +9,8 @@ from tkinterdnd2 import DND_FILES
 
 # Local imports
 from utils import *
-from views import CanvasView
+
+LOGO_PATH = os.path.join("resources", "images", "logo.ico")
 
 
 class MainView(CTkFrame):
@@ -62,12 +63,18 @@ class MainView(CTkFrame):
         """
         Event handler for the drop event. Load the dropped image file.
 
+        When several files are dropped the first one is opened as the template and all of
+        them are queued for a batch run with its watermark.
+
         Parameters:
             event (tkinter.Event): The drop event.
         """
-        # Load the dropped image file
-        file_path = event.data
-        self.process_img_url(file_path)
+        # The drop data is a Tcl list, paths with spaces are wrapped in braces
+        file_paths = self.tk.splitlist(event.data)
+        if len(file_paths) > 1:
+            self.process_img_url(file_paths[0], batch_paths=list(file_paths))
+        elif file_paths:
+            self.process_img_url(file_paths[0])
 
     def get_button_img(self):
         """
@@ -77,12 +84,13 @@ class MainView(CTkFrame):
         if file_path:
             self.process_img_url(file_path)
 
-    def process_img_url(self, file_path):
+    def process_img_url(self, file_path, batch_paths=None):
         """
         Process the image file and switch to the CanvasView.
 
         Parameters:
             file_path (str): The path of the image file.
+            batch_paths (list): Image files queued for a batch run, None for a single image.
         """
         try:
             # Remove curly braces and handle paths with spaces
@@ -90,8 +98,13 @@ class MainView(CTkFrame):
             if file_path.startswith('"') and file_path.endswith('"'):
                 file_path = file_path[1:-1]
 
+            # Import the canvas view on first use to keep it out of startup
+            from views.canvas_view import CanvasView
+
             # Switch view to CanvasView
-            self.switch_view(CanvasView, bg_image_path=file_path)
+            self.switch_view(
+                CanvasView, bg_image_path=file_path, batch_paths=batch_paths
+            )
 
         except Exception as e:
             messagebox.showerror(title="Error loading image", message=e)
@@ -100,16 +113,51 @@ class MainView(CTkFrame):
         """
         Initialize the logo image.
         """
-        logo_path = os.path.join("resources", "images", "logo.ico")
-        with Image.open(logo_path) as pil_img:
-            img_dim = int((self.screen_h / 2) * 0.8)
-            pil_img = pil_img.resize((img_dim, img_dim))
-            self.logo_img = CTkImage(
-                light_image=pil_img, dark_image=pil_img, size=(img_dim, img_dim)
-            )
+        img_dim = int((self.screen_h / 2) * 0.8)
+        pil_img = self.load_scaled_logo(img_dim)
+        self.logo_img = CTkImage(
+            light_image=pil_img, dark_image=pil_img, size=(img_dim, img_dim)
+        )
         self.logo = CTkLabel(self, image=self.logo_img, text=None)
         self.logo.pack(pady=((self.screen_h / 2) - img_dim) / 2)
 
+    def load_scaled_logo(self, img_dim):
+        """
+        Load the logo scaled to img_dim, from the cache when it was scaled before.
+
+        When the cache directory cannot be created the logo is loaded unscaled and uncached.
+
+        Parameters:
+            img_dim (int): The width and height of the logo.
+
+        Returns:
+            Image: The scaled logo.
+        """
+        try:
+            cache_path = os.path.join(get_cache_dir(), f"logo_{img_dim}.png")
+        except OSError:
+            # No cache directory, load the logo as is and let CTkImage scale it when drawn
+            with Image.open(LOGO_PATH) as pil_img:
+                pil_img.load()
+                return pil_img
+
+        try:
+            if os.path.getmtime(cache_path) >= os.path.getmtime(LOGO_PATH):
+                with Image.open(cache_path) as pil_img:
+                    pil_img.load()
+                    return pil_img
+        except OSError:
+            pass
+
+        # Decode and scale the icon, then keep the result for the next launches
+        with Image.open(LOGO_PATH) as pil_img:
+            pil_img = pil_img.resize((img_dim, img_dim))
+        try:
+            pil_img.save(cache_path)
+        except OSError:
+            pass
+        return pil_img
+
     def initiate_add_watermark_text(self):
         """
         Initialize the "Add Watermark" text label.
@@ -144,7 +192,7 @@ class MainView(CTkFrame):
         """
         self.drag_text = CTkLabel(
             self,
-            text="or drag file here",
+            text="or drag files here",
             font=("Open Sans", 15),
             text_color=WHITE,
         )
@@ -0,0 +1,39 @@
+from .spec import WatermarkSpec
+from .render import (
+    get_font,
+    cache_stats,
+    rasterize_text,
+    rasterize_image,
+    transform_image,
+    rotate_watermark,
+    text_tile,
+    image_tile,
+    apply_opacity,
+    render_text_watermark,
+    render_image_watermark,
+    render_watermark,
+    load_watermark_image,
+    create_img_grid,
+    tile_watermark,
+    composite_watermark,
+    apply_watermark,
+)
+from .tiling import grid_shape, lattice_layout, lattice_positions
+from .cache import LRUCache
+from .tile_cache import TileCache, get_tile_cache, set_tile_cache
+from .pipeline import RenderPipeline
+from .fonts import find_font, get_font_index
+from .decode import fit_size, oriented_size, decode_preview
+from .streaming import save_streaming, streaming_supported, read_strips, SaveCancelled
+from .saving import save_image
+from .encoding import ENCODER_PROFILES, DEFAULT_PROFILE, encoder_options
+from .layout import WatermarkLayout, ANCHORS
+
+
+def __getattr__(name):
+    # The process pool machinery is only needed by batch runs
+    if name in ("run_batch", "BatchStats"):
+        from . import batch
+
+        return getattr(batch, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,130 @@
+# Standard library imports
+import argparse
+import sys
+
+# Third-party library imports
+
+# Local imports
+from watermarker import (
+    WatermarkSpec,
+    WatermarkLayout,
+    run_batch,
+    ENCODER_PROFILES,
+    DEFAULT_PROFILE,
+)
+
+# Image size a layout is placed on before the batch scales it to each image
+LAYOUT_REFERENCE = (1000, 1000)
+
+
+def build_parser():
+    """
+    Build the command line parser.
+
+    Returns:
+        ArgumentParser: The parser with its sub-commands.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m watermarker", description="Headless Watermarker tools."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="Watermark many images with one spec.")
+    batch.add_argument("inputs", nargs="+", help="Image files or directories.")
+    batch.add_argument("-o", "--output", required=True, help="Output directory.")
+    kind = batch.add_mutually_exclusive_group(required=True)
+    kind.add_argument("--text", help="Text watermark.")
+    kind.add_argument("--logo", help="Path to an image watermark.")
+    kind.add_argument(
+        "--layout",
+        help="JSON layout exported from the app, the style and placement options are ignored.",
+    )
+    batch.add_argument("--font", default="Arial")
+    batch.add_argument("--color", default="#000000")
+    batch.add_argument("--size", type=float, default=1.0, help="Multiple of 60px.")
+    batch.add_argument("--opacity", type=int, default=100, help="Percent, 1-100.")
+    batch.add_argument("--rotation", type=int, default=0, help="Degrees.")
+    batch.add_argument(
+        "--tile",
+        default="Single",
+        choices=["Single", "Multiple Square", "Multiple Diamond"],
+    )
+    batch.add_argument("--gap", type=int, default=50, help="Tile gap in pixels.")
+    batch.add_argument(
+        "--position",
+        type=float,
+        nargs=2,
+        default=(0.5, 0.5),
+        metavar=("X", "Y"),
+        help="Watermark center relative to the image size.",
+    )
+    batch.add_argument(
+        "--profile",
+        default=DEFAULT_PROFILE,
+        choices=list(ENCODER_PROFILES),
+        help="Encoder speed vs size trade-off.",
+    )
+    batch.add_argument("-j", "--workers", type=int, help="Worker processes.")
+    return parser
+
+
+def batch_command(args):
+    """Run the batch sub-command and print its throughput."""
+    if args.layout:
+        # Layouts are relative to each image, render them for a reference and scale
+        try:
+            spec = WatermarkLayout.load(args.layout).to_spec(LAYOUT_REFERENCE)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"error: cannot load layout {args.layout}: {e}", file=sys.stderr)
+            return 2
+        reference_size = LAYOUT_REFERENCE
+    else:
+        spec = batch_spec(args)
+        reference_size = None
+
+    def report(path, error):
+        if error:
+            print(f"{path}: {error}", file=sys.stderr)
+
+    try:
+        stats = run_batch(
+            spec,
+            args.inputs,
+            args.output,
+            args.workers,
+            report,
+            args.profile,
+            reference_size=reference_size,
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(stats.summary())
+    return 1 if stats.failed else 0
+
+
+def batch_spec(args):
+    """Build the spec of the batch sub-command from its style and placement options."""
+    return WatermarkSpec(
+        is_text=args.text is not None,
+        text=args.text or "",
+        font=args.font,
+        color=args.color,
+        image_path=args.logo,
+        size=args.size,
+        opacity=args.opacity,
+        rotation=args.rotation,
+        tile=args.tile,
+        tile_gap=args.gap,
+        position=tuple(args.position),
+    )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "batch":
+        return batch_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
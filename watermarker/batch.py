@@ -0,0 +1,291 @@
+# Standard library imports
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from utils import STREAMING_MIN_PIXELS
+from .render import apply_watermark, load_watermark_image, render_watermark
+from .streaming import save_streaming, streaming_supported
+from .encoding import DEFAULT_PROFILE, encoder_options, get_format, get_metadata
+from .decode import get_orientation, apply_orientation
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp")
+
+# Per-process state set by the pool initializer
+worker_spec = None
+worker_logo = None
+worker_profile = DEFAULT_PROFILE
+worker_reference = None
+
+
+def walk_images(directory):
+    """Yield the image files under a directory, recursively."""
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def collect_images(paths):
+    """
+    Expand the given files and directories into a sorted list of image files.
+
+    Args:
+        paths (list): File and directory paths.
+
+    Returns:
+        list: Paths of the image files found.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(walk_images(path))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def is_within(path, directory):
+    """Return whether path is directory or inside it, both given as real paths."""
+    try:
+        return os.path.commonpath([path, directory]) == directory
+    except ValueError:
+        # Paths on different drives
+        return False
+
+
+def batch_jobs(paths, output_dir):
+    """
+    Pair every image of the given files and directories with its output path.
+
+    Images found in a directory keep their path relative to that directory under output_dir,
+    files given directly are written to output_dir under their own name. A file given twice
+    is processed once. ValueError is raised if output_dir holds an input file or lies inside an
+    input directory, or if two inputs would be written to the same output file.
+
+    Args:
+        paths (list): Input files and directories.
+        output_dir (str): Directory the watermarked files are written to.
+
+    Returns:
+        list: The (input path, output path) pairs, sorted by input path.
+    """
+    output_root = os.path.realpath(output_dir)
+    inputs = set()
+    outputs = {}
+    jobs = []
+    for path in paths:
+        if os.path.isdir(path):
+            if is_within(output_root, os.path.realpath(path)):
+                raise ValueError(
+                    f"the output folder {output_dir} is the input folder {path} "
+                    "or inside it"
+                )
+            root, files = path, walk_images(path)
+        else:
+            root, files = os.path.dirname(path), [path]
+
+        for file in files:
+            real_path = os.path.realpath(file)
+            if real_path in inputs:
+                continue
+            if is_within(real_path, output_root):
+                raise ValueError(f"the output folder {output_dir} contains the input {file}")
+            inputs.add(real_path)
+
+            out_path = os.path.join(output_dir, os.path.relpath(file, root))
+            key = os.path.normcase(os.path.realpath(out_path))
+            if key in outputs:
+                raise ValueError(
+                    f"{outputs[key]} and {file} would both be written to {out_path}"
+                )
+            outputs[key] = file
+            jobs.append((file, out_path))
+    return sorted(jobs)
+
+
+def load_batch_watermark(spec):
+    """
+    Decode the logo of a spec and render the watermark once, to fail before a batch starts.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings shared by the batch.
+
+    Returns:
+        Image: The RGBA logo, None for text watermarks. ValueError is raised when the logo
+        cannot be read or the spec cannot be rendered, e.g. for an unknown color.
+    """
+    try:
+        logo = None if spec.is_text else load_watermark_image(spec.image_path)
+        render_watermark(spec, logo)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"invalid watermark: {e}") from e
+    return logo
+
+
+def init_worker(spec, logo=None, profile=DEFAULT_PROFILE, reference_size=None):
+    """
+    Store the spec and the logo decoded by the parent once per worker process.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings shared by the batch.
+        logo (Image): The RGBA logo for image watermarks.
+        profile (str): The encoder profile of the outputs.
+        reference_size (tuple): The image size the spec pixels refer to, None for output pixels.
+    """
+    global worker_spec, worker_logo, worker_profile, worker_reference
+    worker_spec = spec
+    worker_logo = logo
+    worker_profile = profile
+    worker_reference = reference_size
+
+
+def watermark_file(job):
+    """
+    Watermark a single file with the worker spec and save it.
+
+    Args:
+        job (tuple): The (input path, output path) pair.
+
+    Returns:
+        tuple: The input path, bytes read, bytes written and an error message or None.
+    """
+    in_path, out_path = job
+    try:
+        with Image.open(in_path) as bg_image:
+            pixels = bg_image.width * bg_image.height
+            is_streamed = pixels >= STREAMING_MIN_PIXELS and streaming_supported(
+                in_path, out_path
+            )
+            scale = 1.0
+            if worker_reference:
+                # Keep the watermark the same share of the short edge as on the reference
+                scale = min(bg_image.size) / min(worker_reference)
+            if not is_streamed:
+                metadata = get_metadata(bg_image.info)
+                # Watermark the image upright, its orientation is reset in the metadata
+                upright = apply_orientation(bg_image, get_orientation(bg_image))
+                upright.load()
+                apply_watermark(upright, worker_spec, worker_logo, scale=scale)
+                image_format = get_format(out_path)
+                upright.save(
+                    out_path,
+                    image_format,
+                    **encoder_options(image_format, worker_profile, metadata),
+                )
+
+        # Large uncompressed images are composited strip by strip to keep worker memory bounded
+        if is_streamed:
+            save_streaming(
+                in_path,
+                out_path,
+                worker_spec,
+                worker_logo,
+                scale=scale,
+                profile=worker_profile,
+            )
+        return in_path, os.path.getsize(in_path), os.path.getsize(out_path), None
+    except Exception as e:
+        return in_path, 0, 0, str(e)
+
+
+class BatchStats:
+    """
+    BatchStats accumulates throughput figures for a batch run.
+
+    Attributes:
+        images (int): Number of images written.
+        failed (list): (path, error) pairs of the images that failed.
+        bytes_in (int): Bytes read from the input files.
+        bytes_out (int): Bytes written to the output files.
+        elapsed (float): Wall time in seconds.
+    """
+
+    def __init__(self):
+        self.images = 0
+        self.failed = []
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.elapsed = 0.0
+
+    @property
+    def images_per_sec(self):
+        return self.images / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mb_per_sec(self):
+        return self.bytes_in / 1e6 / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """Return a one-line human readable summary."""
+        return (
+            f"{self.images} images, {len(self.failed)} failed in {self.elapsed:.2f}s: "
+            f"{self.images_per_sec:.2f} images/sec, {self.mb_per_sec:.2f} MB/sec"
+        )
+
+
+def run_batch(
+    spec,
+    paths,
+    output_dir,
+    workers=None,
+    progress=None,
+    profile=DEFAULT_PROFILE,
+    reference_size=None,
+    cancel=None,
+):
+    """
+    Apply one watermark spec to many images across a process pool.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings, sizes in output pixels.
+        paths (list): Input files and directories.
+        output_dir (str): Directory the watermarked files are written to, mirroring the
+            layout of the input directories.
+        workers (int): Number of worker processes, defaults to the CPU count.
+        progress (callable): Called with (path, error) after each image.
+        profile (str): The encoder profile of the outputs, see ENCODER_PROFILES.
+        reference_size (tuple): The image size the spec pixels refer to. Watermarks are then
+            scaled to every image by the ratio of the short edges instead of being in output
+            pixels.
+        cancel (Event): Once set, images that have not started are dropped.
+
+    Returns:
+        BatchStats: Throughput figures of the run. ValueError is raised before any directory
+        is created if the watermark is invalid, see load_batch_watermark, or if the outputs
+        would overwrite inputs or each other, see batch_jobs.
+    """
+    logo = load_batch_watermark(spec)
+    jobs = batch_jobs(paths, output_dir)
+    for out_dir in {os.path.dirname(out_path) for _, out_path in jobs} | {output_dir}:
+        os.makedirs(out_dir, exist_ok=True)
+    stats = BatchStats()
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(spec, logo, profile, reference_size),
+    ) as executor:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        for path, bytes_in, bytes_out, error in executor.map(
+            watermark_file, jobs, chunksize=chunksize
+        ):
+            if error:
+                stats.failed.append((path, error))
+            else:
+                stats.images += 1
+                stats.bytes_in += bytes_in
+                stats.bytes_out += bytes_out
+            if progress:
+                progress(path, error)
+            if cancel is not None and cancel.is_set():
+                executor.shutdown(wait=True, cancel_futures=True)
+                break
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
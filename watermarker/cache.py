@@ -0,0 +1,126 @@
+# Standard library imports
+from collections import OrderedDict
+from threading import Lock
+
+# Third-party library imports
+
+# Local imports
+
+
+def image_nbytes(image):
+    """Return the approximate pixel buffer size of a PIL Image."""
+    return image.width * image.height * len(image.getbands())
+
+
+class LRUCache:
+    """
+    LRUCache is a thread-safe least-recently-used cache bounded by entry count and bytes.
+
+    Parameters:
+        max_items (int): Maximum number of entries.
+        max_bytes (int): Maximum total size of the entries, None for no byte bound.
+        sizeof (callable): Returns the size in bytes of a value, required with max_bytes.
+
+    Attributes:
+        hits (int): Lookups that found an entry.
+        misses (int): Lookups that did not.
+        evictions (int): Entries dropped to respect the bounds.
+    """
+
+    def __init__(self, max_items, max_bytes=None, sizeof=None):
+        """
+        Initialize the LRUCache.
+
+        Args:
+            max_items (int): Maximum number of entries.
+            max_bytes (int): Maximum total size of the entries, None for no byte bound.
+            sizeof (callable): Returns the size in bytes of a value.
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """
+        Return the value of key and mark it as most recently used.
+
+        Args:
+            key: The cache key.
+            default: Returned when key is not cached.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Cache value under key, evicting the least recently used entries over the bounds.
+
+        Values larger than max_bytes on their own are not cached.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        size = self.sizeof(value)
+        with self.lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.nbytes += size
+            while len(self.entries) > self.max_items or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_create(self, key, create):
+        """
+        Return the cached value of key, creating and caching it on a miss.
+
+        Args:
+            key: The cache key.
+            create (callable): Creates the value.
+        """
+        value = self.get(key)
+        if value is None:
+            value = create()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Return the counters of the cache.
+
+        Returns:
+            dict: hits, misses, evictions, items and bytes.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "items": len(self.entries),
+                "bytes": self.nbytes,
+            }
@@ -0,0 +1,64 @@
+# Standard library imports
+
+# Third-party library imports
+
+# Local imports
+
+
+def clip_to(dest_size, position, size):
+    """
+    Clip a box of the given size placed at position to the bounds of a destination.
+
+    Args:
+        dest_size (tuple): The (width, height) of the destination.
+        position (tuple): The (x, y) of the box top-left corner in the destination.
+        size (tuple): The (width, height) of the box.
+
+    Returns:
+        tuple: The visible (left, upper, right, lower) inside the box and its (x, y) in the
+            destination, or None if the box is outside the destination.
+    """
+    x, y = position
+    left, upper = max(0, -x), max(0, -y)
+    right = min(size[0], dest_size[0] - x)
+    lower = min(size[1], dest_size[1] - y)
+    if left >= right or upper >= lower:
+        return None
+    return (left, upper, right, lower), (x + left, y + upper)
+
+
+def blend_into(dest, overlay, position):
+    """
+    Alpha-composite an RGBA overlay over the destination at a position, in place.
+
+    Only the non-transparent part of the overlay that lies inside the destination is touched.
+    Destinations without alpha take a paste with the overlay as its own mask, which is exactly
+    the over operator when the destination is opaque. RGBA destinations are composited with
+    alpha_composite on the covered region, which keeps the destination transparency instead of
+    replacing it with the overlay alpha as a masked paste does.
+
+    Args:
+        dest (Image): The destination image, modified in place.
+        overlay (Image): The RGBA overlay.
+        position (tuple): The (x, y) of the overlay top-left corner in the destination.
+
+    Returns:
+        Image: The destination image.
+    """
+    # Skip the transparent margins of the overlay
+    bbox = overlay.getbbox()
+    if bbox is None:
+        return dest
+    position = (position[0] + bbox[0], position[1] + bbox[1])
+    clipped = clip_to(dest.size, position, (bbox[2] - bbox[0], bbox[3] - bbox[1]))
+    if clipped is None:
+        return dest
+    (left, upper, right, lower), position = clipped
+    box = (bbox[0] + left, bbox[1] + upper, bbox[0] + right, bbox[1] + lower)
+
+    if dest.mode == "RGBA":
+        dest.alpha_composite(overlay, position, box)
+    else:
+        region = overlay.crop(box)
+        dest.paste(region, position, region)
+    return dest
@@ -0,0 +1,123 @@
+# Standard library imports
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+
+# Modes Image.reduce supports
+REDUCIBLE_MODES = ("L", "LA", "RGB", "RGBA", "CMYK", "I", "F")
+
+ORIENTATION_TAG = 0x0112
+# Transpose that turns the stored pixels of each EXIF orientation upright
+ORIENTATION_TRANSPOSE = {
+    2: Image.FLIP_LEFT_RIGHT,
+    3: Image.ROTATE_180,
+    4: Image.FLIP_TOP_BOTTOM,
+    5: Image.TRANSPOSE,
+    6: Image.ROTATE_270,
+    7: Image.TRANSVERSE,
+    8: Image.ROTATE_90,
+}
+
+
+def fit_size(size, max_size):
+    """
+    Calculate the largest size with the aspect ratio of size that fits in max_size.
+
+    Sizes already contained in max_size are returned unchanged.
+
+    Args:
+        size (tuple): The (width, height) to fit.
+        max_size (tuple): The (width, height) bounds.
+
+    Returns:
+        tuple: The fitted (width, height).
+    """
+    img_w, img_h = size
+    max_w, max_h = max_size
+
+    # Check if the image is already contained in the bounds
+    if img_w <= max_w and img_h <= max_h:
+        return size
+
+    # Calculate the new size to fit within the bounds while maintaining the aspect ratio
+    img_aspect_ratio = img_w / img_h
+    if img_aspect_ratio > max_w / max_h:
+        return max_w, int(max_w / img_aspect_ratio)
+    return int(max_h * img_aspect_ratio), max_h
+
+
+def get_orientation(image):
+    """
+    Return the EXIF orientation of an opened image, 1 (upright) when it has none.
+
+    Args:
+        image (Image): An opened image.
+
+    Returns:
+        int: The orientation, 1 to 8.
+    """
+    orientation = image.getexif().get(ORIENTATION_TAG, 1)
+    return orientation if orientation in ORIENTATION_TRANSPOSE else 1
+
+
+def oriented_size(image):
+    """
+    Return the size of an opened image as it is displayed, after its EXIF orientation.
+
+    Args:
+        image (Image): An opened image.
+
+    Returns:
+        tuple: The upright (width, height).
+    """
+    if get_orientation(image) >= 5:
+        return image.height, image.width
+    return image.size
+
+
+def apply_orientation(image, orientation):
+    """
+    Turn decoded pixels upright according to an EXIF orientation.
+
+    Args:
+        image (Image): The decoded image.
+        orientation (int): The EXIF orientation of its source, see get_orientation.
+
+    Returns:
+        Image: The image itself when it is already upright, otherwise a transposed copy.
+    """
+    if orientation not in ORIENTATION_TRANSPOSE:
+        return image
+    return image.transpose(ORIENTATION_TRANSPOSE[orientation])
+
+
+def decode_preview(image, size):
+    """
+    Decode an opened image straight at a reduced scale and resize it to size.
+
+    JPEG files are asked for a DCT-scaled decode (1/2, 1/4 or 1/8) with draft(), other formats
+    are box-reduced by an integer factor before the final resize, so the full resolution frame
+    is never resampled. The preview is turned upright by the EXIF orientation of the image.
+
+    Args:
+        image (Image): An opened, not yet loaded, image.
+        size (tuple): The upright (width, height) of the preview.
+
+    Returns:
+        Image: The preview image.
+    """
+    orientation = get_orientation(image)
+    if orientation >= 5:
+        # The stored pixels are transposed, decode them to the transposed size
+        size = size[1], size[0]
+    if image.size == tuple(size):
+        return apply_orientation(image.copy(), orientation)
+
+    # Let the decoder skip work where it can, the draft size is never below size
+    image.draft(image.mode, size)
+    factor = min(image.width // size[0], image.height // size[1])
+    if factor > 1 and image.mode in REDUCIBLE_MODES:
+        image = image.reduce(factor)
+    return apply_orientation(image.resize(size), orientation)
@@ -0,0 +1,95 @@
+# Standard library imports
+import os
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from .decode import ORIENTATION_TAG
+
+# Encoder options of each profile, by Pillow format name
+ENCODER_PROFILES = {
+    "fast": {
+        "PNG": {"compress_level": 1},
+        "JPEG": {"quality": 90, "subsampling": "4:2:0"},
+        "WEBP": {"quality": 90, "method": 0},
+    },
+    "balanced": {
+        "PNG": {"compress_level": 6},
+        "JPEG": {"quality": 90, "subsampling": "4:2:0", "optimize": True},
+        "WEBP": {"quality": 85, "method": 4},
+    },
+    "smallest": {
+        "PNG": {"compress_level": 9},
+        "JPEG": {
+            "quality": 82,
+            "subsampling": "4:2:0",
+            "optimize": True,
+            "progressive": True,
+        },
+        "WEBP": {"quality": 80, "method": 6},
+    },
+}
+DEFAULT_PROFILE = "balanced"
+
+# Formats whose Pillow encoder writes the exif and icc_profile options
+METADATA_FORMATS = ("PNG", "JPEG", "WEBP")
+
+
+def get_format(path):
+    """
+    Return the Pillow format name matching the extension of path.
+
+    Args:
+        path (str): The output file path.
+
+    Returns:
+        str: The format name, e.g. "PNG".
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        return Image.registered_extensions()[extension]
+    except KeyError:
+        raise ValueError(f"unknown image file extension: {extension!r}")
+
+
+def get_metadata(info):
+    """
+    Pick the metadata of a source image that is carried over to the output.
+
+    Outputs are written upright, so the EXIF orientation is reset to 1. The EXIF thumbnail is
+    dropped, it would still show the image without the watermark.
+
+    Args:
+        info (dict): The info dictionary of the source image.
+
+    Returns:
+        dict: The "exif" and raw "icc_profile" bytes the source has.
+    """
+    metadata = {key: info[key] for key in ("exif", "icc_profile") if info.get(key)}
+    if "exif" in metadata:
+        exif = Image.Exif()
+        exif.load(metadata["exif"])
+        if ORIENTATION_TAG in exif:
+            exif[ORIENTATION_TAG] = 1
+        # Serializing keeps IFD0 and its sub-IFDs, the thumbnail lives in IFD1
+        metadata["exif"] = exif.tobytes()
+    return metadata
+
+
+def encoder_options(image_format, profile=DEFAULT_PROFILE, metadata=None):
+    """
+    Return the Image.save options of a format for an encoder profile.
+
+    Args:
+        image_format (str): The Pillow format name.
+        profile (str): "fast", "balanced" or "smallest".
+        metadata (dict): EXIF and ICC data from get_metadata to embed.
+
+    Returns:
+        dict: The keyword arguments for Image.save.
+    """
+    options = dict(ENCODER_PROFILES[profile].get(image_format, {}))
+    if metadata and image_format in METADATA_FORMATS:
+        options.update(metadata)
+    return options
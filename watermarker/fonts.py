@@ -0,0 +1,239 @@
+# Standard library imports
+from threading import Lock
+import json
+import os
+import sys
+
+# Third-party library imports
+from PIL import ImageFont
+
+# Local imports
+from utils import get_cache_dir
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+FALLBACK_FAMILIES = ("DejaVu Sans", "Arial", "Liberation Sans", "Helvetica")
+INDEX_VERSION = 1
+
+# The font index of this process, loaded on first lookup
+font_index = None
+font_index_lock = Lock()
+
+
+def get_font_dirs():
+    """
+    Return the system and user font directories of the current platform that exist.
+
+    Returns:
+        list: Font directory paths.
+    """
+    if sys.platform == "win32":
+        windir = os.environ.get("WINDIR", "C:\\Windows")
+        local = os.environ.get("LOCALAPPDATA", "")
+        dirs = [
+            os.path.join(windir, "Fonts"),
+            os.path.join(local, "Microsoft", "Windows", "Fonts"),
+        ]
+    elif sys.platform == "darwin":
+        dirs = [
+            "/System/Library/Fonts",
+            "/Library/Fonts",
+            os.path.expanduser("~/Library/Fonts"),
+        ]
+    else:
+        dirs = [
+            "/usr/share/fonts",
+            "/usr/local/share/fonts",
+            os.path.expanduser("~/.fonts"),
+            os.path.expanduser("~/.local/share/fonts"),
+        ]
+    return [directory for directory in dirs if os.path.isdir(directory)]
+
+
+def scan_font_dirs(font_dirs):
+    """
+    Walk the font directories, recording their modification times and font files.
+
+    Args:
+        font_dirs (list): Font directory paths.
+
+    Returns:
+        tuple: A {directory: mtime} dict and the list of font file paths.
+    """
+    mtimes, files = {}, []
+    for font_dir in font_dirs:
+        for root, _, names in os.walk(font_dir):
+            mtimes[root] = os.stat(root).st_mtime
+            files.extend(
+                os.path.join(root, name)
+                for name in names
+                if name.lower().endswith(FONT_EXTENSIONS)
+            )
+    return mtimes, files
+
+
+def build_font_index(font_dirs):
+    """
+    Build a font index mapping family and style names to font files.
+
+    Args:
+        font_dirs (list): Font directory paths.
+
+    Returns:
+        dict: The index with "version", "dirs" ({directory: mtime}) and
+        "fonts" ({family: {style: path}}), names lower-cased.
+    """
+    mtimes, files = scan_font_dirs(font_dirs)
+    fonts = {}
+    for path in sorted(files):
+        try:
+            family, style = ImageFont.truetype(path, size=10).getname()
+        except OSError:
+            continue
+        if family:
+            fonts.setdefault(family.lower(), {}).setdefault(
+                (style or "regular").lower(), path
+            )
+    return {"version": INDEX_VERSION, "dirs": mtimes, "fonts": fonts}
+
+
+def is_index_current(index, font_dirs):
+    """
+    Check that a persisted index matches the font directories on disk.
+
+    Only directory modification times are compared, so no font file is opened.
+
+    Args:
+        index (dict): The persisted font index.
+        font_dirs (list): Font directory paths.
+
+    Returns:
+        bool: True if no font directory was added, removed or changed.
+    """
+    if index.get("version") != INDEX_VERSION:
+        return False
+    known_dirs = index.get("dirs", {})
+    if not all(font_dir in known_dirs for font_dir in font_dirs):
+        return False
+    for directory, mtime in known_dirs.items():
+        try:
+            if os.stat(directory).st_mtime != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def load_font_index(index_path=None):
+    """
+    Load the persisted font index, rebuilding and saving it when font directories changed.
+
+    Args:
+        index_path (str): Path of the index file, defaults to the user cache directory. The
+            index is only kept in memory when that directory cannot be created.
+
+    Returns:
+        dict: The font index.
+    """
+    font_dirs = get_font_dirs()
+    try:
+        if index_path is None:
+            index_path = os.path.join(get_cache_dir(), "font_index.json")
+        with open(index_path, encoding="utf-8") as file:
+            index = json.load(file)
+        if is_index_current(index, font_dirs):
+            return index
+    except (OSError, ValueError):
+        pass
+
+    index = build_font_index(font_dirs)
+    if index_path is None:
+        # The cache directory is not writable, keep the index in memory only
+        return index
+    try:
+        # Write to a temporary file first so concurrent readers never see a partial index
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(index, file)
+        os.replace(temp_path, index_path)
+    except OSError:
+        pass
+    return index
+
+
+def get_font_index():
+    """Return the font index of this process, loading it on first use."""
+    global font_index
+    with font_index_lock:
+        if font_index is None:
+            font_index = load_font_index()
+        return font_index
+
+
+def pick_style(styles, font_weight):
+    """
+    Pick the style of a family that best matches the weight, preferring upright styles.
+
+    Args:
+        styles (dict): {style: path} of a family.
+        font_weight (str): The wanted weight, e.g. "bold" or "regular".
+
+    Returns:
+        str: The path of the chosen style.
+    """
+    font_weight = font_weight.lower()
+
+    def score(style):
+        upright = "italic" not in style and "oblique" not in style
+        return (
+            style == font_weight,
+            font_weight in style and upright,
+            style in ("regular", "book", "normal", "roman"),
+            upright,
+        )
+
+    return styles[max(sorted(styles), key=score)]
+
+
+def find_font(font_family, font_weight="bold"):
+    """
+    Resolve a font family and weight to a font file through the font index.
+
+    Unknown families fall back to a common sans-serif family, as matplotlib did.
+
+    Args:
+        font_family (str): The font family name.
+        font_weight (str): The font weight.
+
+    Returns:
+        str: The font file path, or None if no font is installed.
+    """
+    fonts = get_font_index()["fonts"]
+    for family in (font_family,) + FALLBACK_FAMILIES:
+        if family.lower() in fonts:
+            return pick_style(fonts[family.lower()], font_weight)
+    if fonts:
+        return pick_style(fonts[min(fonts)], font_weight)
+    return None
+
+
+def font_file_key(font_family, font_weight="bold"):
+    """
+    Identify the font file a family and weight resolve to, for persistent cache keys.
+
+    The family name alone would keep serving tiles of a fallback font once the font is
+    installed, and the path alone those of a font file that was since updated, so the
+    modification time and size of the file are included.
+
+    Args:
+        font_family (str): The font family name.
+        font_weight (str): The font weight.
+
+    Returns:
+        tuple: The font file path, its modification time in ns and its size in bytes, or None
+            when Pillow's default font is used.
+    """
+    font_path = find_font(font_family, font_weight)
+    if not font_path:
+        return None
+    stat = os.stat(font_path)
+    return font_path, stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,214 @@
+# Standard library imports
+from dataclasses import dataclass, asdict, fields
+import json
+import os
+
+# Third-party library imports
+
+# Local imports
+from utils import BASE_SIZE
+from .spec import WatermarkSpec
+
+LAYOUT_VERSION = 1
+
+# Reference point of each anchor relative to the image size
+ANCHORS = {
+    "nw": (0.0, 0.0),
+    "n": (0.5, 0.0),
+    "ne": (1.0, 0.0),
+    "w": (0.0, 0.5),
+    "center": (0.5, 0.5),
+    "e": (1.0, 0.5),
+    "sw": (0.0, 1.0),
+    "s": (0.5, 1.0),
+    "se": (1.0, 1.0),
+}
+TILE_MODES = ("Single", "Multiple Square", "Multiple Diamond")
+
+
+def nearest_anchor(position):
+    """
+    Return the anchor of the third of the image a relative position falls in.
+
+    Args:
+        position (tuple): A point relative to the image size (0-1, 0-1).
+
+    Returns:
+        str: The anchor name.
+    """
+
+    def third(value):
+        return 0.0 if value < 1 / 3 else 1.0 if value > 2 / 3 else 0.5
+
+    point = (third(position[0]), third(position[1]))
+    return next(name for name, anchor in ANCHORS.items() if anchor == point)
+
+
+@dataclass(frozen=True)
+class WatermarkLayout:
+    """
+    WatermarkLayout is the resolution-independent, JSON serializable form of a WatermarkSpec.
+
+    Sizes are relative to the short edge of the image and the placement is an anchor point of the
+    image plus an offset relative to the image size, so one layout can be replayed on images of
+    any size.
+
+    Attributes:
+        is_text (bool): True for a text watermark, False for an image (logo) watermark.
+        text (str): The watermark text.
+        font (str): The font family name.
+        color (str): The text color as a hex string.
+        image_path (str): Path to the logo image, relative paths are relative to the layout file.
+        anchor (str): The image point the offset is measured from, see ANCHORS.
+        offset (tuple): The watermark center minus the anchor point, relative to the image size.
+        size (float): The watermark size (BASE_SIZE times the spec size) over the short edge.
+        opacity (int): Opacity in percent (1-100).
+        rotation (int): Rotation in degrees.
+        tile (str): "Single", "Multiple Square" or "Multiple Diamond".
+        tile_gap (float): Gap between tiles over the short edge.
+    """
+
+    is_text: bool = True
+    text: str = "Text"
+    font: str = "Arial"
+    color: str = "#000000"
+    image_path: str = None
+    anchor: str = "center"
+    offset: tuple = (0.0, 0.0)
+    size: float = 0.1
+    opacity: int = 100
+    rotation: int = 0
+    tile: str = "Single"
+    tile_gap: float = 0.05
+
+    def __post_init__(self):
+        if self.anchor not in ANCHORS:
+            raise ValueError(f"unknown anchor: {self.anchor!r}")
+        if self.tile not in TILE_MODES:
+            raise ValueError(f"unknown tile mode: {self.tile!r}")
+        if not self.is_text and not self.image_path:
+            raise ValueError("image layouts need an image_path")
+
+    @classmethod
+    def from_spec(cls, spec, image_size):
+        """
+        Build the layout of a spec placed on an image.
+
+        Args:
+            spec (WatermarkSpec): The watermark settings in pixels of the image.
+            image_size (tuple): The (width, height) the spec pixels refer to.
+
+        Returns:
+            WatermarkLayout: The resolution-independent layout.
+        """
+        short_edge = min(image_size)
+        anchor = nearest_anchor(spec.position)
+        anchor_x, anchor_y = ANCHORS[anchor]
+        return cls(
+            is_text=spec.is_text,
+            text=spec.text,
+            font=spec.font,
+            color=spec.color,
+            image_path=spec.image_path,
+            anchor=anchor,
+            offset=(
+                round(spec.position[0] - anchor_x, 6),
+                round(spec.position[1] - anchor_y, 6),
+            ),
+            size=BASE_SIZE * spec.size / short_edge,
+            opacity=spec.opacity,
+            rotation=spec.rotation,
+            tile=spec.tile,
+            tile_gap=spec.tile_gap / short_edge,
+        )
+
+    def to_spec(self, image_size):
+        """
+        Place the layout on an image.
+
+        Args:
+            image_size (tuple): The (width, height) of the image.
+
+        Returns:
+            WatermarkSpec: The watermark settings in pixels of the image.
+        """
+        short_edge = min(image_size)
+        anchor_x, anchor_y = ANCHORS[self.anchor]
+        return WatermarkSpec(
+            is_text=self.is_text,
+            text=self.text,
+            font=self.font,
+            color=self.color,
+            image_path=self.image_path,
+            size=self.size * short_edge / BASE_SIZE,
+            opacity=self.opacity,
+            rotation=self.rotation,
+            tile=self.tile,
+            tile_gap=round(self.tile_gap * short_edge),
+            position=(anchor_x + self.offset[0], anchor_y + self.offset[1]),
+        )
+
+    def to_dict(self):
+        """
+        Return the layout as a JSON compatible dictionary.
+
+        Returns:
+            dict: The layout fields and the format version.
+        """
+        data = {"version": LAYOUT_VERSION}
+        data.update(asdict(self))
+        data["offset"] = list(self.offset)
+        return data
+
+    @classmethod
+    def from_dict(cls, data, base_dir=None):
+        """
+        Build a layout from a dictionary read from JSON.
+
+        Missing fields keep their defaults and unknown fields are ignored.
+
+        Args:
+            data (dict): The layout fields.
+            base_dir (str): Directory a relative image_path is resolved against.
+
+        Returns:
+            WatermarkLayout: The layout.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("a layout must be a JSON object")
+        version = data.get("version", LAYOUT_VERSION)
+        if version > LAYOUT_VERSION:
+            raise ValueError(f"unsupported layout version: {version}")
+        names = {field.name for field in fields(cls)}
+        values = {name: value for name, value in data.items() if name in names}
+        if "offset" in values:
+            values["offset"] = tuple(values["offset"])
+        image_path = values.get("image_path")
+        if image_path and base_dir and not os.path.isabs(image_path):
+            values["image_path"] = os.path.join(base_dir, image_path)
+        return cls(**values)
+
+    def save(self, path):
+        """
+        Write the layout to a JSON file.
+
+        Args:
+            path (str): The layout file path.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a layout from a JSON file.
+
+        Args:
+            path (str): The layout file path.
+
+        Returns:
+            WatermarkLayout: The layout.
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        return cls.from_dict(data, os.path.dirname(os.path.abspath(path)))
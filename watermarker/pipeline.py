@@ -0,0 +1,178 @@
+# Standard library imports
+from collections import Counter
+import math
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from utils import RESAMPLE_METHOD
+from .render import (
+    rasterize_text,
+    text_raster_key,
+    text_tile,
+    image_tile,
+    apply_opacity,
+    create_img_grid,
+)
+
+
+class RenderPipeline:
+    """
+    RenderPipeline renders watermarks as cached stages: raster -> rotate -> opacity -> tile.
+
+    Logos have no separate raster stage, their rotate stage scales and rotates the original logo
+    in a single affine pass. Full-quality rotate stages go through the disk tile cache, so a
+    text or logo rendered in an earlier session is read back instead of rasterized and rotated;
+    the raster stage then does not run at all.
+
+    Each stage keeps its last result together with the key of every input it depends on,
+    including the keys of the stages before it. A property change therefore recomputes only the
+    stages downstream of the first one whose key changed: a tile gap change only re-tiles and an
+    opacity change only re-modulates alpha and re-tiles.
+
+    With a level of detail above 1 the pipeline is a draft pipeline for interactive use: it
+    renders at 1/lod of the resolution with nearest-neighbour rotation and scales the result up
+    with nearest-neighbour, so the output has the size of a full-quality render.
+
+    Parameters:
+        image (Image): The RGBA logo for image watermarks.
+        lod (int): Level of detail divisor, 1 for full quality.
+    """
+
+    def __init__(self, image=None, lod=1):
+        """
+        Initialize the RenderPipeline.
+
+        Args:
+            image (Image): The RGBA logo for image watermarks.
+            lod (int): Level of detail divisor, 1 for full quality.
+        """
+        self.image = image
+        self.lod = lod
+        self.resample = RESAMPLE_METHOD if lod == 1 else Image.NEAREST
+        self.stages = {}
+        self.runs = Counter()
+
+    def stage(self, name, key, compute):
+        """
+        Return the cached result of a stage, computing it when its key changed.
+
+        Args:
+            name (str): The stage name.
+            key (tuple): Everything the stage result depends on.
+            compute (callable): Computes the stage result.
+
+        Returns:
+            The stage result.
+        """
+        cached = self.stages.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = compute()
+        self.stages[name] = (key, result)
+        self.runs[name] += 1
+        return result
+
+    def render(self, spec, cover_size, scale=1.0):
+        """
+        Render the watermark of the spec, reusing every stage whose inputs did not change.
+
+        Args:
+            spec (WatermarkSpec): The watermark settings.
+            cover_size (tuple): The (width, height) a tiled grid must cover.
+            scale (float): Factor applied to every pixel measure of the spec.
+
+        Returns:
+            Image: The single watermark or the tiled grid.
+        """
+        key, watermark = self.render_stages(
+            spec,
+            tuple(math.ceil(length / self.lod) for length in cover_size),
+            scale / self.lod,
+        )
+        watermark = self.upscale(key, watermark)
+        return watermark
+
+    def render_tile(self, spec, scale=1.0):
+        """
+        Render the single watermark of the spec whatever its tile mode.
+
+        Tiled previews place this one tile at every lattice position instead of rendering a
+        full grid image.
+
+        Args:
+            spec (WatermarkSpec): The watermark settings.
+            scale (float): Factor applied to every pixel measure of the spec.
+
+        Returns:
+            Image: The single watermark.
+        """
+        key, watermark = self.render_stages(
+            spec.evolve(tile="Single"), None, scale / self.lod
+        )
+        watermark = self.upscale(key, watermark)
+        return watermark
+
+    def upscale(self, key, draft):
+        """Scale a draft result back up by the level of detail with nearest-neighbour."""
+        if self.lod == 1:
+            return draft
+        return self.stage(
+            "lod",
+            key,
+            lambda: draft.resize(
+                (draft.width * self.lod, draft.height * self.lod), Image.NEAREST
+            ),
+        )
+
+    def render_stages(self, spec, cover_size, scale):
+        """
+        Run the raster, rotate, opacity and tile stages at the given scale.
+
+        Returns:
+            tuple: The key of the last stage and its result.
+        """
+        # Drafts change on every slider step and are not worth writing to disk
+        cached = self.lod == 1
+        if spec.is_text:
+            raster_key = (True,) + text_raster_key(spec, scale)
+            rotate_key = raster_key + (spec.rotation,)
+            rotated = self.stage(
+                "rotate",
+                rotate_key,
+                lambda: text_tile(
+                    spec,
+                    scale,
+                    self.resample,
+                    lambda: self.stage(
+                        "raster", raster_key, lambda: rasterize_text(spec, scale)
+                    ),
+                    cached,
+                ),
+            )
+        else:
+            # Logos are scaled and rotated from the original in one affine pass
+            rotate_key = (False, id(self.image), spec.size, scale, spec.rotation)
+            rotated = self.stage(
+                "rotate",
+                rotate_key,
+                lambda: image_tile(spec, self.image, scale, self.resample, cached),
+            )
+
+        opacity_key = rotate_key + (spec.opacity,)
+        watermark = self.stage(
+            "opacity", opacity_key, lambda: apply_opacity(rotated, spec)
+        )
+        if spec.tile == "Single":
+            return opacity_key, watermark
+
+        gap = int(spec.tile_gap * scale)
+        tile_key = opacity_key + (spec.tile, gap, tuple(cover_size))
+        return tile_key, self.stage(
+            "tile",
+            tile_key,
+            lambda: create_img_grid(
+                watermark, gap, *cover_size, diamond=spec.tile == "Multiple Diamond"
+            ),
+        )
@@ -0,0 +1,530 @@
+# Standard library imports
+import math
+
+# Third-party library imports
+from PIL import Image, ImageDraw, ImageFont, ImageColor
+
+# Local imports
+from utils import RESAMPLE_METHOD, BASE_SIZE, timed
+from .cache import LRUCache, image_nbytes
+from .fonts import find_font, font_file_key
+from .tiling import grid_shape, lattice_layout, tile_into
+from .composite import blend_into
+from .tile_cache import TileCache, get_tile_cache, logo_digest
+
+FONT_CACHE_ITEMS = 32
+TEXT_CACHE_ITEMS = 256
+TEXT_CACHE_BYTES = 64 * 1024 * 1024
+IDENTITY_LUT = list(range(256))
+
+# FreeType faces and text rasters shared by every render in this process
+font_cache = LRUCache(FONT_CACHE_ITEMS)
+text_raster_cache = LRUCache(TEXT_CACHE_ITEMS, TEXT_CACHE_BYTES, image_nbytes)
+opacity_luts = {}
+
+
+def get_font(font_family, size, font_weight="bold"):
+    """
+    Create or reuse a FreeType font for the given family, weight and size.
+
+    Args:
+        font_family (str): The font family name.
+        size (int): The font size in pixels.
+        font_weight (str): The font weight.
+
+    Returns:
+        FreeTypeFont: The loaded font.
+    """
+
+    def load_font():
+        font_path = find_font(font_family, font_weight)
+        if font_path:
+            return ImageFont.truetype(font=font_path, size=size)
+        return ImageFont.load_default(size=size)
+
+    return font_cache.get_or_create((font_family, font_weight, size), load_font)
+
+
+def cache_stats():
+    """
+    Return the hit, miss and eviction counters of the font, text raster and tile caches.
+
+    Returns:
+        dict: The stats of each cache by name.
+    """
+    stats = {"fonts": font_cache.stats(), "text_rasters": text_raster_cache.stats()}
+    tile_cache = get_tile_cache()
+    if tile_cache is not None:
+        stats["tiles"] = tile_cache.stats()
+    return stats
+
+
+def draw_text(text, font, color, stroke_width):
+    """
+    Draw text fully opaque on a transparent image cropped to its ink.
+
+    Args:
+        text (str): The text to draw.
+        font (FreeTypeFont): The font.
+        color (tuple): The RGB color.
+        stroke_width (int): The stroke width in pixels.
+
+    Returns:
+        Image: The RGBA text raster.
+    """
+    # Get text image size (hight set to double because of inaccuracy of getbbox method)
+    text_bbox = font.getbbox(text, stroke_width=stroke_width)
+    text_image_size = (
+        max(1, text_bbox[2] - text_bbox[0]),
+        max(1, (text_bbox[3] - text_bbox[1]) * 2),
+    )
+
+    # Create PIL image
+    watermark = Image.new("RGBA", text_image_size, (0, 0, 0, 0))
+
+    # Draw the text on the image with the given parameters
+    draw = ImageDraw.Draw(watermark)
+    draw.text(
+        (text_image_size[0] / 2, text_image_size[1] / 2),
+        text,
+        font=font,
+        fill=color + (255,),
+        stroke_width=stroke_width,
+        stroke_fill=color + (255,),
+        anchor="mm",
+        align="center",
+    )
+
+    # Crop to the bounding box of the alpha channel
+    bbox = watermark.getchannel("A").getbbox()
+    if bbox:
+        watermark = watermark.crop(bbox)
+    return watermark
+
+
+@timed("text_raster")
+def rasterize_text(spec, scale=1.0):
+    """
+    Rasterize the text of a watermark, fully opaque and cropped to its ink.
+
+    Rasters are shared through a bounded LRU cache and must not be modified in place.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        scale (float): Factor applied to every pixel measure of the spec.
+
+    Returns:
+        Image: The RGBA text raster.
+    """
+    key = text_raster_key(spec, scale)
+    text, font, color, size, stroke_width = key
+    return text_raster_cache.get_or_create(
+        key, lambda: draw_text(text, get_font(font, size), color, stroke_width)
+    )
+
+
+def text_raster_key(spec, scale=1.0):
+    """
+    Return everything the text raster of a watermark depends on.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        scale (float): Factor applied to every pixel measure of the spec.
+
+    Returns:
+        tuple: The text, font, RGB color, font size and stroke width.
+    """
+    color = ImageColor.getcolor(spec.color, "RGB")
+    size = max(1, int(spec.size * BASE_SIZE * scale))
+    stroke_width = max(1, round(scale))
+    return (spec.text, spec.font, color, size, stroke_width)
+
+
+def cached_tile(key_parts, create, cached=True):
+    """
+    Return a rotated tile from the disk tile cache, rendering and storing it on a miss.
+
+    Args:
+        key_parts (tuple): Everything the tile depends on.
+        create (callable): Renders the RGBA tile.
+        cached (bool): False to bypass the disk cache, e.g. for drafts.
+
+    Returns:
+        Image: The RGBA tile, read-only when it comes from the cache.
+    """
+    tile_cache = get_tile_cache() if cached else None
+    if tile_cache is None:
+        return create()
+    return tile_cache.get_or_create(TileCache.key(*key_parts), create)
+
+
+@timed("text_tile")
+def text_tile(spec, scale=1.0, resample=RESAMPLE_METHOD, rasterize=None, cached=True):
+    """
+    Rasterize and rotate the text of a watermark, through the disk tile cache.
+
+    The cache key holds the font file the family resolves to, see font_file_key.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        scale (float): Factor applied to every pixel measure of the spec.
+        resample (int): The rotation resampling filter.
+        rasterize (callable): Returns the text raster on a miss, rasterize_text by default.
+        cached (bool): False to bypass the disk cache.
+
+    Returns:
+        Image: The rotated, fully opaque RGBA text.
+    """
+    rasterize = rasterize or (lambda: rasterize_text(spec, scale))
+    key_parts = (
+        ("text",)
+        + text_raster_key(spec, scale)
+        + (font_file_key(spec.font), spec.rotation % 360, resample)
+    )
+    return cached_tile(
+        key_parts,
+        lambda: rotate_watermark(rasterize(), spec.rotation, resample),
+        cached,
+    )
+
+
+@timed("logo_tile")
+def image_tile(spec, image, scale=1.0, resample=RESAMPLE_METHOD, cached=True):
+    """
+    Scale and rotate a logo, through the disk tile cache keyed by the logo pixels.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        image (Image): The RGBA logo.
+        scale (float): Factor applied to every pixel measure of the spec.
+        resample (int): The resampling filter.
+        cached (bool): False to bypass the disk cache.
+
+    Returns:
+        Image: The scaled and rotated, fully opaque RGBA logo.
+    """
+    key_parts = (
+        "logo",
+        logo_digest(image),
+        logo_size(spec, image, scale),
+        spec.rotation % 360,
+        resample,
+    )
+    return cached_tile(
+        key_parts, lambda: transform_image(spec, image, scale, resample), cached
+    )
+
+
+def load_watermark_image(image_path):
+    """
+    Load a logo image as RGBA.
+
+    Args:
+        image_path (str): Path to the logo image.
+
+    Returns:
+        Image: The RGBA logo.
+    """
+    with Image.open(image_path) as image:
+        return image.convert("RGBA")
+
+
+def logo_size(spec, image, scale=1.0):
+    """
+    Calculate the size of a logo watermark, its height being the size property.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        image (Image): The RGBA logo.
+        scale (float): Factor applied to every pixel measure of the spec.
+
+    Returns:
+        tuple: The (width, height) of the scaled logo.
+    """
+    size = max(1, int(spec.size * BASE_SIZE * scale))
+    img_w, img_h = image.size
+    return (max(1, int(size * img_w / img_h)), size)
+
+
+def rasterize_image(spec, image, scale=1.0):
+    """
+    Resize a logo to the size of the watermark.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        image (Image): The RGBA logo.
+        scale (float): Factor applied to every pixel measure of the spec.
+
+    Returns:
+        Image: The resized RGBA logo.
+    """
+    return image.resize(logo_size(spec, image, scale))
+
+
+def transform_image(spec, image, scale=1.0, resample=RESAMPLE_METHOD):
+    """
+    Scale and rotate a logo in a single affine resampling pass.
+
+    The scale and the rotation are composed into one matrix, so the logo is not resampled once
+    to resize it and again to rotate it. Resize filters low-pass the source but affine sampling
+    does not, so logos shrunk by 2x or more are first box-reduced by the integer part of the
+    factor to avoid aliasing. Right-angle rotations are lossless transposes of the resized logo.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        image (Image): The RGBA logo.
+        scale (float): Factor applied to every pixel measure of the spec.
+        resample (int): The resampling filter, NEAREST, BILINEAR or BICUBIC.
+
+    Returns:
+        Image: The scaled and rotated RGBA logo, expanded to fit.
+    """
+    target_w, target_h = logo_size(spec, image, scale)
+    rotation = spec.rotation % 360
+    if rotation % 90 == 0:
+        watermark = image.resize((target_w, target_h), resample)
+        return rotate_watermark(watermark, rotation)
+
+    factor = min(image.width // target_w, image.height // target_h)
+    if factor >= 2:
+        image = image.reduce(factor)
+    scale_x = target_w / image.width
+    scale_y = target_h / image.height
+
+    # Size of the rotated target rectangle, rounded to absorb float noise
+    cos = math.cos(math.radians(rotation))
+    sin = math.sin(math.radians(rotation))
+    out_w = math.ceil(round(target_w * abs(cos) + target_h * abs(sin), 6))
+    out_h = math.ceil(round(target_w * abs(sin) + target_h * abs(cos), 6))
+
+    # Inverse mapping from an output pixel to the source: un-center, un-rotate, un-scale
+    a, b = cos / scale_x, -sin / scale_x
+    d, e = sin / scale_y, cos / scale_y
+    center_x, center_y = out_w / 2, out_h / 2
+    matrix = (
+        a,
+        b,
+        image.width / 2 - a * center_x - b * center_y,
+        d,
+        e,
+        image.height / 2 - d * center_x - e * center_y,
+    )
+    return image.transform((out_w, out_h), Image.AFFINE, matrix, resample)
+
+
+def rotate_watermark(watermark, rotation, resample=RESAMPLE_METHOD):
+    """
+    Rotate a watermark raster, expanding it to fit.
+
+    Args:
+        watermark (Image): The RGBA raster.
+        rotation (int): Rotation in degrees.
+        resample (int): The resampling filter.
+
+    Returns:
+        Image: The rotated raster.
+    """
+    if rotation == 0:
+        return watermark
+    return watermark.rotate(rotation, expand=True, resample=resample)
+
+
+def opacity_lut(opacity):
+    """
+    Return the point() table of an RGBA image that scales alpha by opacity percent.
+
+    The color bands map to themselves and alpha is multiplied by the opacity, so partially
+    transparent edges keep their anti-aliasing. Tables are built once per opacity value.
+
+    Args:
+        opacity (int): The opacity in percent.
+
+    Returns:
+        list: The 1024 entry lookup table.
+    """
+    lut = opacity_luts.get(opacity)
+    if lut is None:
+        factor = int(opacity * 255 / 100)
+        lut = IDENTITY_LUT * 3 + [i * factor // 255 for i in range(256)]
+        opacity_luts[opacity] = lut
+    return lut
+
+
+@timed("opacity")
+def apply_opacity(watermark, spec):
+    """
+    Apply the opacity property to a rendered raster.
+
+    Scaling alpha by a constant commutes with rotation, so this runs after it as the last step
+    of the watermark and an opacity change does not need a new raster or rotation. The existing
+    alpha is multiplied in one lookup pass, for text and logos alike.
+
+    Args:
+        watermark (Image): The RGBA raster.
+        spec (WatermarkSpec): The watermark settings.
+
+    Returns:
+        Image: A faded copy of the raster, or the raster itself at full opacity.
+    """
+    if spec.opacity >= 100:
+        return watermark
+    return watermark.point(opacity_lut(spec.opacity))
+
+
+def render_text_watermark(spec, scale=1.0):
+    """
+    Rasterize, rotate and fade a text watermark.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        scale (float): Factor applied to every pixel measure of the spec.
+
+    Returns:
+        Image: The rotated RGBA watermark.
+    """
+    return apply_opacity(text_tile(spec, scale), spec)
+
+
+def render_image_watermark(spec, image=None, scale=1.0):
+    """
+    Resize, rotate and fade an image watermark.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        image (Image): The RGBA logo, loaded from spec.image_path when omitted.
+        scale (float): Factor applied to every pixel measure of the spec.
+
+    Returns:
+        Image: The rotated RGBA watermark.
+    """
+    if image is None:
+        image = load_watermark_image(spec.image_path)
+    return apply_opacity(image_tile(spec, image, scale), spec)
+
+
+def render_watermark(spec, image=None, scale=1.0):
+    """
+    Render a single (untiled) watermark for the given spec.
+
+    Args:
+        spec (WatermarkSpec): The watermark settings.
+        image (Image): The RGBA logo for image watermarks.
+        scale (float): Factor applied to every pixel measure of the spec.
+
+    Returns:
+        Image: The rotated RGBA watermark.
+    """
+    if spec.is_text:
+        return render_text_watermark(spec, scale)
+    return render_image_watermark(spec, image, scale)
+
+
+@timed("grid")
+def create_img_grid(image, gap, width, height, diamond=False):
+    """
+    Create a grid of images with a specified gap between them.
+
+    The grid is large enough to cover a width x height area from any position of its center.
+
+    Args:
+        image (Image): The PIL Image to create a grid from.
+        gap (int): The gap between images in pixels.
+        width (int): Width of the area to cover.
+        height (int): Height of the area to cover.
+        diamond (bool): True if the grid should have a diamond pattern.
+
+    Returns:
+        Image: The resulting PIL Image grid.
+    """
+    img_width, img_height = image.size
+    rows, cols = grid_shape(image.size, gap, width, height)
+
+    # Create a blank image and fill it with the lattice
+    img_grid = Image.new(
+        "RGBA", (cols * (img_width + gap), rows * (img_height + gap)), (0, 0, 0, 0)
+    )
+    return tile_into(img_grid, image, gap, (0, 0), rows, cols, diamond)
+
+
+def tile_watermark(watermark, spec, width, height, scale=1.0):
+    """
+    Apply the tile property of the spec to a rendered watermark.
+
+    Args:
+        watermark (Image): The rendered single watermark.
+        spec (WatermarkSpec): The watermark settings.
+        width (int): Width of the area to cover.
+        height (int): Height of the area to cover.
+        scale (float): Factor applied to the tile gap.
+
+    Returns:
+        Image: The watermark itself for "Single", otherwise the tiled grid.
+    """
+    if spec.tile == "Single":
+        return watermark
+    return create_img_grid(
+        watermark,
+        int(spec.tile_gap * scale),
+        width,
+        height,
+        diamond=spec.tile == "Multiple Diamond",
+    )
+
+
+@timed("composite")
+def composite_watermark(dest, watermark, spec, bg_size, scale=1.0, top=0):
+    """
+    Composite a rendered watermark into a destination covering rows of the background.
+
+    Args:
+        dest (Image): The destination image, modified in place.
+        watermark (Image): The rendered single watermark.
+        spec (WatermarkSpec): The watermark settings.
+        bg_size (tuple): The (width, height) of the full background.
+        scale (float): Factor from spec pixels to background pixels.
+        top (int): Background row the first destination row corresponds to.
+
+    Returns:
+        Image: The destination image.
+    """
+    bg_w, bg_h = bg_size
+    center_x = spec.position[0] * bg_w
+    center_y = spec.position[1] * bg_h
+
+    if spec.tile == "Single":
+        # Center the watermark on its relative position
+        w, h = watermark.size
+        x = int(center_x - w / 2)
+        y = int(center_y - h / 2)
+        return blend_into(dest, watermark, (x, y - top))
+
+    # Anchor the lattice on a tile centered on the relative position, as the preview is
+    gap = int(spec.tile_gap * scale)
+    (origin_x, origin_y), rows, cols = lattice_layout(
+        (center_x, center_y), watermark.size, gap, bg_size
+    )
+    origin = (origin_x, origin_y - top)
+    diamond = spec.tile == "Multiple Diamond"
+    return tile_into(dest, watermark, gap, origin, rows, cols, diamond, use_mask=True)
+
+
+def apply_watermark(bg_image, spec, image=None, watermark=None, scale=1.0):
+    """
+    Render the watermark of the spec at the background resolution and composite it.
+
+    Text and logo are rasterized directly at the target size, so no preview raster is upscaled,
+    and tiles are composited straight into the background without an intermediate grid.
+
+    Args:
+        bg_image (Image): The background image, modified in place.
+        spec (WatermarkSpec): The watermark settings.
+        image (Image): The RGBA logo for image watermarks.
+        watermark (Image): A pre-rendered single watermark to reuse.
+        scale (float): Factor from spec pixels to background pixels.
+
+    Returns:
+        Image: The watermarked background.
+    """
+    if watermark is None:
+        watermark = render_watermark(spec, image, scale)
+    return composite_watermark(bg_image, watermark, spec, bg_image.size, scale)
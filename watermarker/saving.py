@@ -0,0 +1,281 @@
+# Standard library imports
+import io
+import os
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from utils import timed
+from .render import render_watermark, composite_watermark
+from .streaming import save_streaming, check_cancel, partial_path
+from .encoding import DEFAULT_PROFILE, encoder_options, get_format, get_metadata
+from .decode import get_orientation, apply_orientation
+
+WRITE_CHUNK = 1024 * 1024
+
+# Measured cost of each save stage in milliseconds per megapixel, used to weight the stages.
+# Decode and encode costs depend on the format, and encode costs on the profile too.
+DECODE_COSTS = {"JPEG": 15, "PNG": 36, "WEBP": 37, "BMP": 4, "TIFF": 2}
+ENCODE_COSTS = {
+    "PNG": {"fast": 130, "balanced": 220, "smallest": 290},
+    "JPEG": {"fast": 6, "balanced": 18, "smallest": 30},
+    "WEBP": {"fast": 85, "balanced": 215, "smallest": 650},
+    "BMP": 2,
+    "TIFF": 2,
+}
+STAGE_COSTS = {"render": 1, "composite": 6, "write": 1}
+DEFAULT_COST = 15
+SAVE_STAGE_ORDER = ("decode", "render", "composite", "encode", "write")
+
+# Typical encoded size relative to the raw pixel data, used to estimate encode progress
+ENCODED_RATIOS = {"PNG": 0.5, "JPEG": 0.1, "WEBP": 0.1}
+
+STREAMING_STAGES = {
+    "render": (0.0, 0.05),
+    "stream": (0.05, 0.95),
+    "encode": (0.95, 1.0),
+}
+
+
+def save_stages(source_format, image_format, profile=DEFAULT_PROFILE):
+    """
+    Return the share of the total save time of each stage, weighted by its measured cost.
+
+    Args:
+        source_format (str): The Pillow format name of the background image.
+        image_format (str): The Pillow format name of the output image.
+        profile (str): The encoder profile, see ENCODER_PROFILES.
+
+    Returns:
+        dict: The (start, end) overall fraction of each stage, for StageProgress.
+    """
+    encode_cost = ENCODE_COSTS.get(image_format, DEFAULT_COST)
+    if isinstance(encode_cost, dict):
+        encode_cost = encode_cost[profile]
+    costs = dict(
+        STAGE_COSTS,
+        decode=DECODE_COSTS.get(source_format, DEFAULT_COST),
+        encode=encode_cost,
+    )
+    total = sum(costs.values())
+
+    stages, start = {}, 0.0
+    for stage in SAVE_STAGE_ORDER:
+        end = start + costs[stage] / total
+        stages[stage] = (start, end)
+        start = end
+    return stages
+
+
+class ProgressReader(io.BufferedReader):
+    """
+    ProgressReader is a binary file that reports the fraction of it read so far.
+
+    Pillow decodes an image in blocks read from its file, so the reads track the decode.
+
+    Parameters:
+        path (str): The file path.
+        progress (callable): Called with the fraction of the file read after each read, may be
+            None.
+    """
+
+    def __init__(self, path, progress=None):
+        """
+        Initialize the ProgressReader.
+
+        Args:
+            path (str): The file path.
+            progress (callable): Called with the fraction of the file read after each read, may
+                be None.
+        """
+        super().__init__(io.FileIO(path))
+        self.length = os.fstat(self.fileno()).st_size
+        self.progress = progress
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if self.progress and self.length:
+            self.progress(min(1.0, self.tell() / self.length))
+        return data
+
+
+class ProgressBuffer(io.BytesIO):
+    """
+    ProgressBuffer is an in-memory file that reports its size against an expected size.
+
+    Pillow writes an encoded image in blocks as the encoder produces them, so the writes track
+    the encode. Encoders that produce the whole file at once report only when they finish.
+
+    Parameters:
+        expected (int): The estimated size of the encoded file in bytes.
+        progress (callable): Called with the estimated fraction written after each write.
+    """
+
+    def __init__(self, expected, progress):
+        """
+        Initialize the ProgressBuffer.
+
+        Args:
+            expected (int): The estimated size of the encoded file in bytes.
+            progress (callable): Called with the estimated fraction written after each write.
+        """
+        super().__init__()
+        self.expected = max(1, expected)
+        self.progress = progress
+
+    def write(self, data):
+        written = super().write(data)
+        # The estimate can be short, hold the bar below the end until the encoder is done
+        self.progress(min(0.95, self.tell() / self.expected))
+        return written
+
+
+class StageProgress:
+    """
+    StageProgress turns progress within named stages into the overall fraction of a save.
+
+    Parameters:
+        stages (dict): The (start, end) overall fraction of each stage.
+        progress (callable): Called as progress(stage, fraction), may be None.
+    """
+
+    def __init__(self, stages, progress):
+        """
+        Initialize the StageProgress.
+
+        Args:
+            stages (dict): The (start, end) overall fraction of each stage.
+            progress (callable): Called as progress(stage, fraction), may be None.
+        """
+        self.stages = stages
+        self.progress = progress
+
+    def __call__(self, stage, done=0.0):
+        """
+        Report progress within a stage.
+
+        Args:
+            stage (str): The stage name.
+            done (float): The fraction of the stage that is done.
+        """
+        if self.progress:
+            start, end = self.stages[stage]
+            self.progress(stage, start + (end - start) * done)
+
+
+@timed("save")
+def save_image(
+    src_path,
+    out_path,
+    spec,
+    image=None,
+    scale=1.0,
+    streaming=False,
+    progress=None,
+    cancel=None,
+    profile=DEFAULT_PROFILE,
+):
+    """
+    Watermark an image and save it through explicit decode, render, composite, encode and
+    write stages.
+
+    The frame is encoded in memory and written in chunks to a file next to out_path that is
+    renamed when complete. Cancellation is checked between stages and between written chunks;
+    streaming saves run render once and then decode, composite and encode strip by strip,
+    checking cancellation between strips. A cancelled or failed save leaves no partial output.
+
+    Progress is reported from inside the decode reads, the encoder writes and the strip loop,
+    and each stage gets a share of the bar weighted by its measured cost, see save_stages.
+
+    Args:
+        src_path (str): Path of the background image.
+        out_path (str): Path of the output image.
+        spec (WatermarkSpec): The watermark settings, or None to save the background as is.
+        image (Image): The RGBA logo for image watermarks.
+        scale (float): Factor from spec pixels to background pixels.
+        streaming (bool): Composite and write the image strip by strip.
+        progress (callable): Called as progress(stage, fraction) with the overall fraction.
+        cancel (Event): Once set, the save stops with SaveCancelled.
+        profile (str): The encoder profile, see ENCODER_PROFILES. Source EXIF and ICC data
+            are carried over, see get_metadata.
+    """
+    if streaming:
+        report = StageProgress(STREAMING_STAGES, progress)
+        report("render")
+        watermark = None if spec is None else render_watermark(spec, image, scale)
+        check_cancel(cancel)
+
+        # The writer encodes the last buffered rows once every strip is written
+        def strip_progress(done):
+            report("stream" if done < 1 else "encode", done)
+
+        save_streaming(
+            src_path,
+            out_path,
+            spec,
+            watermark=watermark,
+            scale=scale,
+            progress=strip_progress,
+            cancel=cancel,
+            profile=profile,
+        )
+        report("encode", 1.0)
+        return
+
+    image_format = get_format(out_path)
+    with ProgressReader(src_path) as file, Image.open(file) as source:
+        # The stage weights depend on the source format, known once the header is read
+        report = StageProgress(save_stages(source.format, image_format, profile), progress)
+        report("decode")
+        file.progress = lambda done: report("decode", done)
+        metadata = get_metadata(source.info)
+        # Watermark the image upright, as it is previewed
+        bg_image = apply_orientation(source, get_orientation(source))
+        bg_image.load()
+    check_cancel(cancel)
+
+    if spec is not None:
+        report("render")
+        watermark = render_watermark(spec, image, scale)
+        check_cancel(cancel)
+
+        report("composite")
+        composite_watermark(bg_image, watermark, spec, bg_image.size, scale)
+        check_cancel(cancel)
+
+    report("encode")
+    width, height = bg_image.size
+    expected = width * height * len(bg_image.getbands())
+    expected *= ENCODED_RATIOS.get(image_format, 1.0)
+    buffer = ProgressBuffer(int(expected), lambda done: report("encode", done))
+    options = encoder_options(image_format, profile, metadata)
+    bg_image.save(buffer, image_format, **options)
+    check_cancel(cancel)
+
+    write_file(out_path, buffer.getbuffer(), lambda done: report("write", done), cancel)
+
+
+def write_file(path, data, progress=None, cancel=None):
+    """
+    Write data in chunks to a temporary file and rename it to path when complete.
+
+    Args:
+        path (str): The output file path.
+        data (bytes): The file contents.
+        progress (callable): Called with the fraction written after each chunk.
+        cancel (Event): Checked between chunks, SaveCancelled is raised once it is set.
+    """
+    part_path = partial_path(path)
+    try:
+        with open(part_path, "wb") as file:
+            for start in range(0, len(data), WRITE_CHUNK):
+                check_cancel(cancel)
+                file.write(data[start : start + WRITE_CHUNK])
+                if progress:
+                    progress(min(1.0, (start + WRITE_CHUNK) / len(data)))
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    os.replace(part_path, path)
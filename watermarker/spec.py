@@ -0,0 +1,53 @@
+# Standard library imports
+from dataclasses import dataclass, replace
+
+# Third-party library imports
+
+# Local imports
+
+
+@dataclass(frozen=True)
+class WatermarkSpec:
+    """
+    WatermarkSpec is an immutable snapshot of every value needed to render a watermark.
+
+    It mirrors the controls of the Properties window so the same settings can be rendered by the
+    GUI or by any headless path (batch CLI, worker processes) without touching Tk variables.
+
+    Attributes:
+        is_text (bool): True for a text watermark, False for an image (logo) watermark.
+        text (str): The watermark text.
+        font (str): The font family name.
+        color (str): The text color as a hex string.
+        image_path (str): Path to the logo image for image watermarks.
+        size (float): Size multiplier of BASE_SIZE pixels.
+        opacity (int): Opacity in percent (1-100).
+        rotation (int): Rotation in degrees.
+        tile (str): "Single", "Multiple Square" or "Multiple Diamond".
+        tile_gap (int): Gap between tiles in pixels.
+        position (tuple): Center of the watermark relative to the background size (0-1, 0-1).
+    """
+
+    is_text: bool = True
+    text: str = "Text"
+    font: str = "Arial"
+    color: str = "#000000"
+    image_path: str = None
+    size: float = 1.0
+    opacity: int = 100
+    rotation: int = 0
+    tile: str = "Single"
+    tile_gap: int = 50
+    position: tuple = (0.5, 0.5)
+
+    def evolve(self, **changes):
+        """
+        Return a copy of the spec with the given fields replaced.
+
+        Args:
+            **changes: Field names and their new values.
+
+        Returns:
+            WatermarkSpec: The updated spec.
+        """
+        return replace(self, **changes)
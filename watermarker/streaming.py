@@ -0,0 +1,336 @@
+# Standard library imports
+import os
+import struct
+import zlib
+
+# Third-party library imports
+from PIL import Image, ImageChops
+
+# Local imports
+from utils import timed
+from .render import render_watermark, composite_watermark
+from .encoding import DEFAULT_PROFILE, encoder_options, get_format, get_metadata
+from .decode import get_orientation
+
+STRIP_HEIGHT = 256
+
+# Output formats with an incremental strip writer
+STRIP_WRITER_FORMATS = ("PNG", "BMP")
+
+
+class SaveCancelled(Exception):
+    """Raised by a save whose cancel event was set."""
+
+
+def check_cancel(cancel):
+    """Raise SaveCancelled if the cancel event is set."""
+    if cancel is not None and cancel.is_set():
+        raise SaveCancelled()
+
+
+def partial_path(path):
+    """Return the temporary path a file is written to before being renamed to path."""
+    base, extension = os.path.splitext(path)
+    return f"{base}.part{extension}"
+
+
+def read_raw_strips(path, strip_height):
+    """
+    Yield strips of an uncompressed image straight from the file, without decoding the rest.
+
+    Args:
+        path (str): Path of the image file.
+        strip_height (int): Rows per strip.
+
+    Yields:
+        tuple: The (top row, strip Image) pairs.
+    """
+    with Image.open(path) as image:
+        (_, _, offset, args), width, height = image.tile[0], image.width, image.height
+        mode = image.mode
+    rawmode, stride, orientation = args if isinstance(args, tuple) else (args, 0, 1)
+    if not stride:
+        stride = len(Image.new(mode, (width, 1)).tobytes("raw", rawmode))
+
+    with open(path, "rb") as file:
+        for top in range(0, height, strip_height):
+            rows = min(strip_height, height - top)
+            # Bottom-up files (negative orientation) store the last row first
+            first = top if orientation >= 0 else height - top - rows
+            file.seek(offset + first * stride)
+            data = file.read(rows * stride)
+            yield top, Image.frombytes(
+                mode, (width, rows), data, "raw", rawmode, stride, orientation
+            )
+
+
+def is_raw_source(image):
+    """
+    Return whether an opened image can be read strip by strip without decoding it whole.
+
+    Args:
+        image (Image): The image, opened but not loaded.
+
+    Returns:
+        bool: True for single-tile uncompressed L, RGB or RGBA files (BMP, PPM, raw TIFF).
+    """
+    return (
+        len(image.tile) == 1
+        and image.tile[0][0] == "raw"
+        and image.tile[0][1] == (0, 0) + image.size
+        and image.mode in ("L", "RGB", "RGBA")
+    )
+
+
+def streaming_supported(src_path, out_path):
+    """
+    Return whether save_streaming keeps its memory bounded for a source and output pair.
+
+    Compressed sources are decoded whole by Pillow, and only PNG and BMP outputs are encoded
+    strip by strip, so any other pair would hold the full frame anyway. Sources with an EXIF
+    orientation are excluded too, strips are read in storage order and cannot be turned upright.
+
+    Args:
+        src_path (str): Path of the background image.
+        out_path (str): Path of the output image.
+
+    Returns:
+        bool: True when both the reader and the writer are incremental.
+    """
+    with Image.open(src_path) as source:
+        return (
+            is_raw_source(source)
+            and get_orientation(source) == 1
+            and get_format(out_path) in STRIP_WRITER_FORMATS
+        )
+
+
+def read_strips(path, strip_height=STRIP_HEIGHT):
+    """
+    Yield horizontal strips of the image at path.
+
+    Uncompressed single-tile files (BMP, PPM, raw TIFF) are read strip by strip, so memory stays
+    bounded by the strip size. Compressed formats must be decoded whole by Pillow and are then
+    sliced without a further copy of the full frame.
+
+    Args:
+        path (str): Path of the image file.
+        strip_height (int): Rows per strip.
+
+    Yields:
+        tuple: The (top row, strip Image) pairs.
+    """
+    with Image.open(path) as image:
+        if not is_raw_source(image):
+            image.load()
+            for top in range(0, image.height, strip_height):
+                yield top, image.crop(
+                    (0, top, image.width, min(image.height, top + strip_height))
+                )
+            return
+    yield from read_raw_strips(path, strip_height)
+
+
+class PngStripWriter:
+    """
+    PngStripWriter encodes a PNG incrementally, one strip of rows at a time.
+
+    Rows use the PNG "Up" filter, computed with ImageChops.subtract_modulo, and are deflated
+    through a single zlib stream written out as IDAT chunks. An ICC profile and EXIF data are
+    written as iCCP and eXIf chunks ahead of the pixels.
+
+    Parameters:
+        path (str): Output file path.
+        size (tuple): The (width, height) of the image.
+        mode (str): "RGB" or "RGBA".
+        compress_level (int): zlib compression level.
+        metadata (dict): Optional "icc_profile" and "exif" bytes.
+    """
+
+    def __init__(self, path, size, mode, compress_level=6, metadata=None):
+        self.file = open(path, "wb")
+        self.width, _ = size
+        self.mode = mode
+        self.compressor = zlib.compressobj(compress_level)
+        self.previous_row = Image.new(mode, (self.width, 1))
+
+        color_type = 6 if mode == "RGBA" else 2
+        self.file.write(b"\x89PNG\r\n\x1a\n")
+        header = struct.pack(">IIBBBBB", *size, 8, color_type, 0, 0, 0)
+        self.write_chunk(b"IHDR", header)
+
+        metadata = metadata or {}
+        if metadata.get("icc_profile"):
+            icc = zlib.compress(metadata["icc_profile"])
+            self.write_chunk(b"iCCP", b"ICC Profile\x00\x00" + icc)
+        if metadata.get("exif"):
+            exif = metadata["exif"]
+            if exif.startswith(b"Exif\x00\x00"):
+                exif = exif[6:]
+            self.write_chunk(b"eXIf", exif)
+
+    def write_chunk(self, tag, data):
+        self.file.write(struct.pack(">I", len(data)) + tag + data)
+        self.file.write(struct.pack(">I", zlib.crc32(tag + data)))
+
+    def write(self, strip):
+        """Filter, deflate and write a strip of rows."""
+        rows = strip.height
+        above = Image.new(self.mode, strip.size)
+        above.paste(self.previous_row, (0, 0))
+        above.paste(strip.crop((0, 0, self.width, rows - 1)), (0, 1))
+        self.previous_row = strip.crop((0, rows - 1, self.width, rows))
+
+        filtered = ImageChops.subtract_modulo(strip, above).tobytes()
+        stride = len(filtered) // rows
+        scanlines = b"".join(
+            b"\x02" + filtered[row * stride : (row + 1) * stride] for row in range(rows)
+        )
+        data = self.compressor.compress(scanlines)
+        if data:
+            self.write_chunk(b"IDAT", data)
+
+    def close(self):
+        self.write_chunk(b"IDAT", self.compressor.flush())
+        self.write_chunk(b"IEND", b"")
+        self.file.close()
+
+    def abort(self):
+        """Close the file without finishing it."""
+        self.file.close()
+
+
+class BmpStripWriter:
+    """
+    BmpStripWriter writes a top-down BMP incrementally, one strip of rows at a time.
+
+    Parameters:
+        path (str): Output file path.
+        size (tuple): The (width, height) of the image.
+        mode (str): "RGB" or "RGBA".
+    """
+
+    def __init__(self, path, size, mode):
+        self.file = open(path, "wb")
+        width, height = size
+        self.rawmode, bits = ("BGRA", 32) if mode == "RGBA" else ("BGR", 24)
+        self.stride = (width * bits + 31) // 32 * 4
+        self.padding = b"\x00" * (self.stride - width * bits // 8)
+
+        image_size = self.stride * height
+        self.file.write(b"BM" + struct.pack("<IHHI", 54 + image_size, 0, 0, 54))
+        # A negative height marks the rows as stored top-down
+        self.file.write(
+            struct.pack(
+                "<IiiHHIIiiII", 40, width, -height, 1, bits, 0, image_size, 0, 0, 0, 0
+            )
+        )
+
+    def write(self, strip):
+        """Write a strip of rows."""
+        data = strip.tobytes("raw", self.rawmode)
+        if self.padding:
+            row_bytes = len(data) // strip.height
+            data = b"".join(
+                data[row * row_bytes : (row + 1) * row_bytes] + self.padding
+                for row in range(strip.height)
+            )
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+    def abort(self):
+        """Close the file without finishing it."""
+        self.file.close()
+
+
+def open_strip_writer(path, size, mode, profile=DEFAULT_PROFILE, metadata=None):
+    """
+    Open the strip writer matching the extension of path, see STRIP_WRITER_FORMATS.
+
+    Args:
+        path (str): Output file path.
+        size (tuple): The (width, height) of the image.
+        mode (str): "RGB" or "RGBA".
+        profile (str): The encoder profile, see ENCODER_PROFILES.
+        metadata (dict): EXIF and ICC data from get_metadata to embed.
+
+    Returns:
+        The writer, with write(strip), close() and abort() methods. Other formats raise
+        ValueError.
+    """
+    image_format = get_format(path)
+    options = encoder_options(image_format, profile, metadata)
+    if image_format == "PNG":
+        return PngStripWriter(
+            path, size, mode, options.get("compress_level", 6), metadata
+        )
+    if image_format == "BMP":
+        return BmpStripWriter(path, size, mode)
+    raise ValueError(f"{image_format} images cannot be written strip by strip")
+
+
+@timed("save_streaming")
+def save_streaming(
+    src_path,
+    out_path,
+    spec,
+    image=None,
+    watermark=None,
+    scale=1.0,
+    strip_height=STRIP_HEIGHT,
+    progress=None,
+    cancel=None,
+    profile=DEFAULT_PROFILE,
+):
+    """
+    Watermark an image strip by strip and write it incrementally.
+
+    Only one strip of the background, the rendered watermark and one lattice row band are held at
+    a time, so peak memory does not grow with the image size when streaming_supported is true for
+    the paths; compressed sources are decoded whole first. The output must be PNG or BMP. The file
+    is written next to out_path and renamed when complete, so a failed or cancelled save leaves no
+    partial output.
+
+    Args:
+        src_path (str): Path of the background image.
+        out_path (str): Path of the output image.
+        spec (WatermarkSpec): The watermark settings, or None to copy the background as is.
+        image (Image): The RGBA logo for image watermarks.
+        watermark (Image): A pre-rendered single watermark to reuse.
+        scale (float): Factor from spec pixels to background pixels.
+        strip_height (int): Rows per strip.
+        progress (callable): Called with the fraction of rows written after each strip.
+        cancel (Event): Checked between strips, SaveCancelled is raised once it is set.
+        profile (str): The encoder profile, see ENCODER_PROFILES.
+    """
+    with Image.open(src_path) as source:
+        bg_size = source.size
+        has_alpha = source.mode in ("RGBA", "LA", "PA") or "transparency" in source.info
+        metadata = get_metadata(source.info)
+    mode = "RGBA" if has_alpha else "RGB"
+
+    if watermark is None and spec is not None:
+        watermark = render_watermark(spec, image, scale)
+
+    part_path = partial_path(out_path)
+    writer = open_strip_writer(part_path, bg_size, mode, profile, metadata)
+    try:
+        for top, strip in read_strips(src_path, strip_height):
+            check_cancel(cancel)
+            if strip.mode != mode:
+                strip = strip.convert(mode)
+            if watermark is not None:
+                composite_watermark(strip, watermark, spec, bg_size, scale, top)
+            writer.write(strip)
+            if progress:
+                progress(min(1.0, (top + strip.height) / bg_size[1]))
+        writer.close()
+    except BaseException:
+        writer.abort()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    os.replace(part_path, out_path)
+
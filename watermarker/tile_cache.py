@@ -0,0 +1,258 @@
+# Standard library imports
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+import os
+import struct
+import weakref
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from utils import get_cache_dir
+
+TILE_CACHE_BYTES = 256 * 1024 * 1024
+TILE_SUFFIX = ".tile"
+
+# Magic, width and height in front of the raw RGBA rows of a tile file
+TILE_HEADER = struct.Struct("<4sII")
+TILE_MAGIC = b"WMT1"
+
+# Pixel digests of the logos in use, dropped with the logo
+logo_digests = {}
+
+
+def logo_digest(image):
+    """
+    Return a digest of the pixels of a logo, computed once per logo object.
+
+    Args:
+        image (Image): The RGBA logo.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = logo_digests.get(id(image))
+    if digest is None:
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{image.mode}{image.size}".encode())
+        hasher.update(image.tobytes())
+        digest = logo_digests[id(image)] = hasher.hexdigest()
+        weakref.finalize(image, logo_digests.pop, id(image), None)
+    return digest
+
+
+class TileCache:
+    """
+    TileCache is a persistent, content-addressed cache of rendered watermark tiles.
+
+    Entries are named by a hash of everything the tile depends on (the text or logo pixels and
+    the render parameters), so sessions, views and batch workers share them. A tile is stored as
+    a small header and its raw RGBA rows, which decode without a codec and could be memory
+    mapped. The total size is capped, least recently used files are deleted first; a hit bumps
+    the file modification time, which orders the files across processes.
+
+    Parameters:
+        directory (str): The cache directory, created if needed.
+        max_bytes (int): Maximum total size of the tile files.
+
+    Attributes:
+        hits (int): Lookups that found a tile.
+        misses (int): Lookups that did not.
+        evictions (int): Files deleted to respect the size cap.
+    """
+
+    def __init__(self, directory, max_bytes=TILE_CACHE_BYTES):
+        """
+        Initialize the TileCache and index the files already in directory.
+
+        Args:
+            directory (str): The cache directory, created if needed.
+            max_bytes (int): Maximum total size of the tile files.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # File sizes by name, least recently used first
+        files = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(TILE_SUFFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        self.files = OrderedDict((name, size) for _, name, size in sorted(files))
+        self.nbytes = sum(self.files.values())
+
+    @staticmethod
+    def key(*parts):
+        """
+        Return the file key of a tile from everything it depends on.
+
+        Args:
+            *parts: Values with a stable repr, e.g. strings, numbers and tuples of them.
+
+        Returns:
+            str: The hex digest.
+        """
+        return hashlib.blake2b(repr(parts).encode(), digest_size=20).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + TILE_SUFFIX)
+
+    def get(self, key):
+        """
+        Return the cached tile of key and mark it as most recently used.
+
+        Args:
+            key (str): The tile key.
+
+        Returns:
+            Image: The read-only RGBA tile, None when it is not cached.
+        """
+        name = key + TILE_SUFFIX
+        try:
+            with open(self.path(key), "rb") as file:
+                data = file.read()
+            magic, width, height = TILE_HEADER.unpack_from(data)
+            if magic != TILE_MAGIC or len(data) != TILE_HEADER.size + width * height * 4:
+                raise ValueError("corrupt tile file")
+            os.utime(self.path(key))
+        except (OSError, ValueError, struct.error):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+            if name in self.files:
+                self.files.move_to_end(name)
+            else:
+                # Written by another process since the directory was indexed
+                self.files[name] = len(data)
+                self.nbytes += len(data)
+        pixels = memoryview(data)[TILE_HEADER.size :]
+        return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+    def put(self, key, image):
+        """
+        Store an RGBA tile, deleting the least recently used files over the size cap.
+
+        Tiles larger than an eighth of the cap are not stored. Write errors are ignored, the
+        cache is only an accelerator.
+
+        Args:
+            key (str): The tile key.
+            image (Image): The RGBA tile.
+        """
+        size = TILE_HEADER.size + image.width * image.height * 4
+        if image.mode != "RGBA" or size > self.max_bytes // 8:
+            return
+
+        name = key + TILE_SUFFIX
+        path = self.path(key)
+        part_path = f"{path}.{os.getpid()}.part"
+        try:
+            with open(part_path, "wb") as file:
+                file.write(TILE_HEADER.pack(TILE_MAGIC, image.width, image.height))
+                file.write(image.tobytes())
+            os.replace(part_path, path)
+        except OSError:
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+            return
+
+        with self.lock:
+            self.nbytes += size - self.files.pop(name, 0)
+            self.files[name] = size
+            evicted = []
+            while self.nbytes > self.max_bytes and len(self.files) > 1:
+                evicted_name, evicted_size = self.files.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+                evicted.append(evicted_name)
+        for evicted_name in evicted:
+            try:
+                os.remove(os.path.join(self.directory, evicted_name))
+            except OSError:
+                pass
+
+    def get_or_create(self, key, create):
+        """
+        Return the cached tile of key, creating and storing it on a miss.
+
+        Args:
+            key (str): The tile key.
+            create (callable): Renders the RGBA tile.
+        """
+        tile = self.get(key)
+        if tile is None:
+            tile = create()
+            self.put(key, tile)
+        return tile
+
+    def clear(self):
+        """Delete every tile file."""
+        with self.lock:
+            names = list(self.files)
+            self.files.clear()
+            self.nbytes = 0
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def stats(self):
+        """
+        Return the counters of the cache.
+
+        Returns:
+            dict: hits, misses, evictions, items and bytes.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "items": len(self.files),
+                "bytes": self.nbytes,
+            }
+
+
+# The cache shared by every render in this process, created on first use
+tile_cache = None
+
+
+def get_tile_cache():
+    """
+    Return the process-wide tile cache in the application cache directory.
+
+    Returns:
+        TileCache: The cache, None when it is disabled or the directory is not writable.
+    """
+    global tile_cache
+    if tile_cache is None:
+        try:
+            tile_cache = TileCache(os.path.join(get_cache_dir(), "tiles"))
+        except OSError:
+            # Render without a disk cache when the cache directory is not writable
+            tile_cache = False
+    return tile_cache or None
+
+
+def set_tile_cache(cache):
+    """
+    Replace the process-wide tile cache.
+
+    Args:
+        cache (TileCache): The new cache, None to render without a disk cache.
+    """
+    global tile_cache
+    tile_cache = cache if cache is not None else False
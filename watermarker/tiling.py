@@ -0,0 +1,186 @@
+# Standard library imports
+
+# Third-party library imports
+from PIL import Image
+
+# Local imports
+from .composite import blend_into
+
+
+def grid_shape(tile_size, gap, width, height):
+    """
+    Calculate the rows and columns of a grid that covers a width x height area from any center.
+
+    Args:
+        tile_size (tuple): The (width, height) of a single tile.
+        gap (int): The gap between tiles in pixels.
+        width (int): Width of the area to cover.
+        height (int): Height of the area to cover.
+
+    Returns:
+        tuple: The (rows, cols) of the grid.
+    """
+    tile_w, tile_h = tile_size
+    rows = int(height / (tile_h + gap)) + 3
+    cols = int(width / (tile_w + gap)) + 3
+    return rows, cols
+
+
+def lattice_layout(center, tile_size, gap, cover_size):
+    """
+    Lay out a lattice that has a tile centered on a point and covers a width x height area.
+
+    The lattice is anchored on that tile, so it depends only on the center, the tile and the gap
+    and not on how many cells cover the area: a preview and a save of the same relative position
+    get the same lattice at their own scale. The anchor tile is on an even row, which diamond
+    lattices leave unshifted, and sits where a single watermark would.
+
+    Args:
+        center (tuple): The (x, y) the anchor tile is centered on.
+        tile_size (tuple): The (width, height) of a single tile.
+        gap (int): The gap between tiles in pixels.
+        cover_size (tuple): The (width, height) of the area to cover.
+
+    Returns:
+        tuple: The (x, y) of the lattice top-left corner, its rows and its cols.
+    """
+    tile_w, tile_h = tile_size
+    width, height = cover_size
+    pitch_w, pitch_h = tile_w + gap, tile_h + gap
+    anchor_x = int(center[0] - tile_w / 2)
+    anchor_y = int(center[1] - tile_h / 2)
+
+    # Cells before the anchor reaching past the top-left corner, one more column so the
+    # shifted diamond rows reach the left edge too
+    cols_before = anchor_x // pitch_w + 2
+    rows_before = anchor_y // pitch_h + 1
+    rows_before += rows_before % 2
+    origin_x = anchor_x - cols_before * pitch_w
+    origin_y = anchor_y - rows_before * pitch_h
+
+    rows = (height - origin_y) // pitch_h + 1
+    cols = (width - origin_x) // pitch_w + 1
+    return (origin_x, origin_y), rows, cols
+
+
+def lattice_positions(tile_size, gap, origin, rows, cols, diamond=False):
+    """
+    List the top-left corner of every tile of a square or diamond lattice.
+
+    Args:
+        tile_size (tuple): The (width, height) of a single tile.
+        gap (int): The gap between tiles in pixels.
+        origin (tuple): The (x, y) of the lattice top-left corner.
+        rows (int): Number of lattice rows.
+        cols (int): Number of lattice columns.
+        diamond (bool): True if odd rows are shifted by half a cell.
+
+    Returns:
+        list: The (x, y) of each tile, row by row.
+    """
+    pitch_w, pitch_h = tile_size[0] + gap, tile_size[1] + gap
+    origin_x, origin_y = origin
+    positions = []
+    for row in range(rows):
+        row_x = origin_x
+        if diamond and row % 2 == 1:
+            row_x += pitch_w // 2
+        row_y = origin_y + row * pitch_h
+        positions.extend((row_x + col * pitch_w, row_y) for col in range(cols))
+    return positions
+
+
+def build_row_band(tile, gap, cols):
+    """
+    Build one lattice row by doubling, so it costs log2(cols) pastes instead of cols.
+
+    Args:
+        tile (Image): The RGBA tile.
+        gap (int): The gap between tiles in pixels.
+        cols (int): Number of tiles in the row.
+
+    Returns:
+        Image: An RGBA band of cols tiles, pitch tile width + gap.
+    """
+    tile_w, tile_h = tile.size
+    pitch = tile_w + gap
+    band = Image.new("RGBA", (cols * pitch, tile_h), (0, 0, 0, 0))
+    band.paste(tile, (0, 0))
+
+    filled = 1
+    while filled < cols:
+        count = min(filled, cols - filled)
+        band.paste(band.crop((0, 0, count * pitch, tile_h)), (filled * pitch, 0))
+        filled += count
+    return band
+
+
+def tile_into(dest, tile, gap, origin, rows, cols, diamond=False, use_mask=False):
+    """
+    Composite a square or diamond lattice of tiles straight into the destination.
+
+    The lattice is rows x cols cells of (tile + gap) pixels with its top-left cell at origin;
+    diamond lattices shift odd rows by half a cell. Only rows intersecting the destination are
+    composited, each as one paste of a row band clipped to the lattice and destination bounds.
+
+    Args:
+        dest (Image): The destination image, modified in place.
+        tile (Image): The RGBA tile.
+        gap (int): The gap between tiles in pixels.
+        origin (tuple): The (x, y) of the lattice top-left corner in destination pixels.
+        rows (int): Number of lattice rows.
+        cols (int): Number of lattice columns.
+        diamond (bool): True if the lattice should have a diamond pattern.
+        use_mask (bool): Alpha-composite the tiles instead of replacing destination pixels.
+
+    Returns:
+        Image: The destination image.
+    """
+    dest_w, dest_h = dest.size
+    tile_w, tile_h = tile.size
+    pitch_w, pitch_h = tile_w + gap, tile_h + gap
+    origin_x, origin_y = origin
+
+    # Rows and horizontal extent of the lattice that intersect the destination
+    first_row = max(0, (-origin_y - tile_h) // pitch_h + 1)
+    last_row = min(rows, -((origin_y - dest_h) // pitch_h))
+    clip_x0 = max(0, origin_x)
+    clip_x1 = min(dest_w, origin_x + cols * pitch_w)
+    if first_row >= last_row or clip_x0 >= clip_x1:
+        return dest
+
+    bands, crops = {}, {}
+    for row in range(first_row, last_row):
+        row_x = origin_x
+        if diamond and row % 2 == 1:
+            row_x += pitch_w // 2
+
+        # Clip the band to the lattice and destination; a destination strip shorter than a tile
+        # is clipped vertically too, so it never builds a full-height band
+        row_y = origin_y + row * pitch_h
+        top, bottom = 0, tile_h
+        if dest_h < tile_h:
+            top, bottom = max(0, -row_y), min(tile_h, dest_h - row_y)
+        box = (
+            max(0, clip_x0 - row_x),
+            top,
+            min(cols * pitch_w, clip_x1 - row_x),
+            bottom,
+        )
+        if box[0] >= box[2]:
+            continue
+        if box not in crops:
+            if (top, bottom) not in bands:
+                bands[(top, bottom)] = build_row_band(
+                    tile.crop((0, top, tile_w, bottom)), gap, cols
+                )
+            crops[box] = bands[(top, bottom)].crop((box[0], 0, box[2], bottom - top))
+        row_band = crops[box]
+
+        position = (row_x + box[0], row_y + box[1])
+        if use_mask:
+            blend_into(dest, row_band, position)
+        else:
+            dest.paste(row_band, position)
+
+    return dest